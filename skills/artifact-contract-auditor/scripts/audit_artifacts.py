@@ -4,13 +4,297 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import mmap
+import os
+import re
+import struct
 import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
+from json_stream import JsonStream
 
-def load_json(path: Path, errors: list[str]) -> Any | None:
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
+
+
+CLOSERS = {"[": "]", "{": "}"}
+
+# Optional per-person indexes covered by the integrity pass when present.
+PERSON_INDEXES = ["assertions_by_person.json", "assertions_by_person_by_layer.json"]
+INTEGRITY_EXAMPLES = 5
+
+CACHE_VERSION = 3
+CACHE_MAX_RESULTS = 512
+# Sibling modules whose code shapes audit results; their hashes salt the cache with this script's.
+CACHE_MODULES = ["json_stream.py", "pack_artifacts.py"]
+
+# Bracketed keys in finding labels, e.g. ``assertions_by_id[a.wdqs.P131.000001]``.
+FINDING_KEY_RE = re.compile(r"\[([^\[\]]*)\]")
+PATTERN_EXAMPLES = 3
+
+# Top-level separators in the two-space layout written by the importer. Nested
+# separators carry deeper indentation, so subtracting their count isolates records.
+RECORD_SEPARATOR = b",\n  "
+NESTED_SEPARATOR = b",\n   "
+DEFAULT_CHUNK_MB = 8
+
+
+class ErrorBudgetExceeded(Exception):
+    """Raised inside a walk once the ``--max-errors`` budget is spent."""
+
+
+class FindingSink:
+    """Collects findings for one walk in place of a plain list.
+
+    With ``limit`` set, appending past it raises ``ErrorBudgetExceeded`` so the walk stops
+    early. With ``aggregate`` set, each distinct pattern (bracketed keys replaced by
+    ``[*]``) keeps only a count and the first few example keys instead of every message.
+    """
+
+    def __init__(self, limit: int | None = None, aggregate: bool = False) -> None:
+        self.limit = limit
+        self.aggregate = aggregate
+        self.count = 0
+        self.truncated = False
+        self.messages: list[str] = []
+        self.patterns: dict[str, list[Any]] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, message: str, example: str | None = None) -> None:
+        """Record ``message``; ``example`` overrides its first bracketed key as the pattern example."""
+        if self.limit is not None and self.count >= self.limit:
+            self.truncated = True
+            raise ErrorBudgetExceeded
+        self.count += 1
+        if not self.aggregate:
+            self.messages.append(message)
+            return
+        entry = self.patterns.setdefault(FINDING_KEY_RE.sub("[*]", message), [0, []])
+        entry[0] += 1
+        if len(entry[1]) < PATTERN_EXAMPLES:
+            keys = FINDING_KEY_RE.findall(message)
+            if example is not None or keys:
+                entry[1].append(example if example is not None else keys[0])
+
+    def extend(self, messages: Iterable[str]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def merge(self, other: FindingSink) -> None:
+        """Append ``other``'s findings in order, stopping quietly at this sink's limit."""
+        self.truncated = self.truncated or other.truncated
+        room = None if self.limit is None else self.limit - self.count
+        if not self.aggregate:
+            taken = other.messages if room is None else other.messages[: max(room, 0)]
+            self.messages.extend(taken)
+            self.count += len(taken)
+            self.truncated = self.truncated or len(taken) < len(other.messages)
+            return
+        for pattern, (count, examples) in other.patterns.items():
+            taken = count if room is None else min(count, room)
+            if taken < count:
+                self.truncated = True
+            if taken <= 0:
+                return
+            entry = self.patterns.setdefault(pattern, [0, []])
+            entry[0] += taken
+            entry[1].extend(examples[: min(taken, PATTERN_EXAMPLES - len(entry[1]))])
+            self.count += taken
+            if room is not None:
+                room -= taken
+
+    def pattern_report(self) -> list[dict[str, Any]]:
+        return [
+            {"pattern": pattern, "count": count, "examples": examples}
+            for pattern, (count, examples) in self.patterns.items()
+        ]
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "aggregate": self.aggregate,
+            "count": self.count,
+            "truncated": self.truncated,
+            "messages": self.messages,
+            "patterns": self.patterns,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], limit: int | None, aggregate: bool) -> FindingSink:
+        # A sink keeps either messages or patterns, so one stored in the other mode would restore as empty.
+        if data["aggregate"] != aggregate:
+            raise ValueError("findings were recorded in the other report mode")
+        sink = cls(limit, aggregate)
+        sink.count = data["count"]
+        sink.truncated = data["truncated"]
+        sink.messages = data["messages"]
+        sink.patterns = data["patterns"]
+        return sink
+
+
+@dataclass(frozen=True)
+class AuditOptions:
+    stream: bool = False
+    max_errors: int | None = None
+    sample: float | None = None
+    seed: int = 0
+    aggregate: bool = False
+
+    def sink(self, budget: bool = True) -> FindingSink:
+        return FindingSink(self.max_errors if budget else None, self.aggregate)
+
+    def sampled(self, key: Any) -> bool:
+        """Deterministic per-record choice, independent of streaming, chunking, and worker count."""
+        return zlib.crc32(f"{self.seed}:{key}".encode("utf-8")) < self.sample * 0x100000000
+
+
+CONTRACT_PATH = Path(__file__).resolve().parent.parent / "references" / "contract-profiles.json"
+
+# Contract type -> (isinstance target, noun used in error text).
+CONTRACT_TYPES = {
+    "string": ("str", "a string"),
+    "number": ("(int, float)", "a number"),
+    "boolean": ("bool", "a boolean"),
+    "object": ("dict", "an object"),
+    "array": ("list", "an array"),
+}
+ROOT_TYPES = {"single": "dict", "list": "list", "map": "dict"}
+
+
+@dataclass(frozen=True)
+class ArtifactValidator:
+    """Validators compiled from one artifact entry of the contract.
+
+    ``collection(value, errors, warnings, start=0)`` checks a whole decoded artifact (or a
+    chunk of one, numbering list records from ``start``). ``record(key, value, errors,
+    warnings)`` checks a single list item or map value, as used by streaming. ``id_field``
+    names the field that identifies a list record; its value, not the list index, is the
+    example key reported under ``--aggregate`` and the id the integrity pass joins on.
+    """
+
+    label: str
+    root: str
+    id_field: str | None
+    collection: Callable[..., None]
+    record: Callable[..., None]
+    source: str
+
+
+def _fstring_text(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _emit_record(spec: dict[str, Any], var: str, label: str, pad: str, on_fail: str, out: list[str]) -> None:
+    """Emit checks for one value; ``label`` is f-string source and ``on_fail`` ends the record."""
+    target, noun = CONTRACT_TYPES[spec["type"]]
+    out.append(f"{pad}if not isinstance({var}, {target}):")
+    out.append(f'{pad}    errors.append(f"{label} must be {noun}", ident)')
+    body: list[str] = []
+    _emit_body(spec, var, label, pad if on_fail else pad + "    ", body)
+    if on_fail:
+        if body:
+            out.append(f"{pad}    {on_fail}")
+            out.extend(body)
+    elif body:
+        out.append(f"{pad}else:")
+        out.extend(body)
+
+
+def _emit_body(spec: dict[str, Any], var: str, label: str, pad: str, out: list[str]) -> None:
+    depth = len(pad) // 4
+    if spec["type"] == "object":
+        for field, field_spec in spec.get("fields", {}).items():
+            target, noun = CONTRACT_TYPES[field_spec["type"]]
+            key = repr(field)
+            field_label = f"{label}.{_fstring_text(field)}"
+            if field_spec.get("optional"):
+                out.append(f"{pad}if {key} in {var} and not isinstance({var}[{key}], {target}):")
+                out.append(f'{pad}    warnings.append(f"{field_label} should be {noun} when present", ident)')
+            elif field_spec.get("fields") or field_spec.get("items"):
+                child = f"v{depth}_{len(out)}"
+                out.append(f"{pad}{child} = {var}.get({key})")
+                _emit_record(field_spec, child, field_label, pad, "", out)
+            else:
+                out.append(f"{pad}if not isinstance({var}.get({key}), {target}):")
+                out.append(f'{pad}    errors.append(f"{field_label} must be {noun}", ident)')
+    elif spec["type"] == "array" and "items" in spec:
+        index, item = f"i{depth}", f"item{depth}"
+        out.append(f"{pad}for {index}, {item} in enumerate({var}):")
+        _emit_record(spec["items"], item, f"{label}[{{{index}}}]", pad + "    ", "continue", out)
+
+
+def compile_artifact(name: str, artifact: dict[str, Any], records: dict[str, Any]) -> ArtifactValidator:
+    """Generate and compile specialized Python validators for one artifact entry."""
+    label = _fstring_text(artifact["label"])
+    root = artifact["root"]
+    id_field = artifact.get("id_field")
+    spec = records[artifact["record"]]
+    if root not in ROOT_TYPES:
+        raise ValueError(f"{name}: unknown root kind {root!r}")
+    if id_field is not None and root != "list":
+        raise ValueError(f"{name}: id_field only applies to list roots")
+    # Example key for aggregated findings: the record's own id when the contract names one.
+    ident = "ident = key"
+    if id_field is not None:
+        field = repr(id_field)
+        ident = f"ident = item.get({field}) if isinstance(item, dict) and isinstance(item.get({field}), str) else key"
+    lines = [
+        "def collection(value, errors, warnings, start=0):",
+        f"    if not isinstance(value, {ROOT_TYPES[root]}):",
+        f'        errors.append(f"{label} expected {ROOT_TYPES[root]}, got {{type(value).__name__}}")',
+        "        return",
+    ]
+    if root == "single":
+        lines.append("    ident = None")
+        _emit_body(spec, "value", label, "    ", lines)
+        lines += ["", "def record(key, value, errors, warnings):", "    collection(value, errors, warnings)"]
+    else:
+        loop = "enumerate(value, start)" if root == "list" else "value.items()"
+        lines += [f"    for key, item in {loop}:", f"        {ident}"]
+        _emit_record(spec, "item", f"{label}[{{key}}]", "        ", "continue", lines)
+        lines += ["", "def record(key, item, errors, warnings):", f"    {ident}"]
+        _emit_record(spec, "item", f"{label}[{{key}}]", "    ", "return", lines)
+    source = "\n".join(lines) + "\n"
+    namespace: dict[str, Any] = {}
+    exec(compile(source, f"<contract {name}>", "exec"), namespace)
+    return ArtifactValidator(artifact["label"], root, id_field, namespace["collection"], namespace["record"], source)
+
+
+def load_contract(path: Path) -> tuple[dict[str, list[str]], dict[str, ArtifactValidator]]:
+    """Load the declarative contract and compile each artifact's validators once per process."""
+    contract = json.loads(path.read_text(encoding="utf-8"))
+    records = contract["records"]
+    validators = {
+        name: compile_artifact(name, artifact, records) for name, artifact in contract["artifacts"].items()
+    }
+    profiles = {name: list(files) for name, files in contract["profiles"].items()}
+    for profile, files in profiles.items():
+        unknown = [name for name in files if name not in validators]
+        if unknown:
+            raise ValueError(f"profile {profile} lists artifacts without contracts: {', '.join(unknown)}")
+    return profiles, validators
+
+
+PROFILES, VALIDATORS = load_contract(CONTRACT_PATH)
+
+# Collection artifacts and their root token; these can be streamed or split into chunks.
+COLLECTION_ROOTS = {
+    name: "[" if validator.root == "list" else "{"
+    for name, validator in VALIDATORS.items()
+    if validator.root != "single"
+}
+
+
+def load_json(path: Path, errors: FindingSink | list[str]) -> Any | None:
     if not path.exists():
         errors.append(f"Missing file: {path}")
         return None
@@ -21,77 +305,537 @@ def load_json(path: Path, errors: list[str]) -> Any | None:
         return None
 
 
-def require_type(value: Any, expected: type, label: str, errors: list[str]) -> bool:
-    if not isinstance(value, expected):
-        errors.append(f"{label} expected {expected.__name__}, got {type(value).__name__}")
+def check_artifact(
+    name: str,
+    value: Any,
+    errors: FindingSink,
+    warnings: FindingSink,
+    start: int = 0,
+    options: AuditOptions | None = None,
+) -> None:
+    validator = VALIDATORS.get(name)
+    if validator is None:
+        return
+    if options is None or options.sample is None or validator.root == "single":
+        validator.collection(value, errors, warnings, start)
+        return
+    if validator.root == "list" and isinstance(value, list):
+        items: Iterable[tuple[Any, Any]] = enumerate(value, start)
+    elif validator.root == "map" and isinstance(value, dict):
+        items = value.items()
+    else:
+        validator.collection(value, errors, warnings, start)  # reports the root type error
+        return
+    for key, record in items:
+        if options.sampled(key):
+            validator.record(key, record, errors, warnings)
+
+
+def streamable(path: Path, name: str) -> bool:
+    """Return True when ``path`` exists and has the root container the stream checker expects.
+
+    Anything else falls back to a full load so type and decode errors keep their usual wording.
+    """
+    if name not in COLLECTION_ROOTS or not path.exists():
         return False
-    return True
+    with path.open("r", encoding="utf-8") as handle:
+        try:
+            return JsonStream(handle, chunk_chars=64).peek() == COLLECTION_ROOTS[name]
+        except UnicodeDecodeError:
+            return False
 
 
-def check_manifest(manifest: Any, errors: list[str]) -> None:
-    if not require_type(manifest, dict, "manifest", errors):
-        return
-    if not isinstance(manifest.get("spec_version"), str):
-        errors.append("manifest.spec_version must be a string")
+def stream_check(path: Path, name: str, errors: FindingSink, warnings: FindingSink, options: AuditOptions) -> None:
+    check_record = VALIDATORS[name].record
+    with path.open("r", encoding="utf-8") as handle:
+        try:
+            stream = JsonStream(handle)
+            items = enumerate(stream.iter_array()) if COLLECTION_ROOTS[name] == "[" else stream.iter_object()
+            for key, record in items:
+                if options.sample is None or options.sampled(key):
+                    check_record(key, record, errors, warnings)
+        except (ValueError, UnicodeDecodeError) as exc:
+            errors.append(f"Invalid JSON in {path}: {exc}")
+
+
+def plan_chunks(path: Path, name: str, chunk_bytes: int) -> list[tuple[int, int, int, int]]:
+    """Split a collection artifact at top-level record boundaries.
+
+    Returns ``(byte_start, byte_end, first_record, record_count)`` per chunk, or an
+    empty list when the file is small or not in the importer's two-space layout.
+    """
+    root = COLLECTION_ROOTS.get(name)
+    if root is None or not path.exists() or path.stat().st_size <= chunk_bytes:
+        return []
+    size = path.stat().st_size
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        head = data[:64]
+        tail = data[-64:]
+        if not head.lstrip().startswith(root.encode()) or not tail.rstrip().endswith(CLOSERS[root].encode()):
+            return []
+        open_at = len(head) - len(head.lstrip())
+        close_at = size - len(tail) + len(tail.rstrip()) - 1
+
+        cuts: list[int] = []
+        pieces = -(-size // chunk_bytes)
+        for k in range(1, pieces):
+            pos = max(k * size // pieces, cuts[-1] + 1 if cuts else open_at)
+            idx = data.find(RECORD_SEPARATOR, pos, close_at)
+            while idx >= 0 and data[idx + len(RECORD_SEPARATOR)] in b" \n":
+                idx = data.find(RECORD_SEPARATOR, idx + 1, close_at)
+            if idx < 0:
+                break
+            cuts.append(idx)
+        if not cuts:
+            return []
+
+        chunks: list[tuple[int, int, int, int]] = []
+        first = 0
+        for start, end in zip([open_at + 1] + [c + 1 for c in cuts], cuts + [close_at]):
+            segment = data[start:end]
+            count = segment.count(RECORD_SEPARATOR) - segment.count(NESTED_SEPARATOR) + 1
+            chunks.append((start, end, first, count))
+            first += count
+    return chunks
+
+
+def audit_file(path: Path, name: str, options: AuditOptions) -> tuple[FindingSink, FindingSink, FindingSink]:
+    load_errors = options.sink()
+    errors = options.sink()
+    warnings = options.sink(budget=False)
+    try:
+        if options.stream and streamable(path, name):
+            stream_check(path, name, errors, warnings, options)
+        else:
+            value = load_json(path, load_errors)
+            if value is not None:
+                check_artifact(name, value, errors, warnings, options=options)
+    except ErrorBudgetExceeded:
+        pass
+    return load_errors, errors, warnings
+
+
+def audit_chunk(
+    path: Path, name: str, chunk: tuple[int, int, int, int], options: AuditOptions
+) -> tuple[FindingSink, FindingSink, FindingSink] | None:
+    """Audit one chunk; ``None`` means the split could not be verified and the file must be redone whole."""
+    start, end, first, count = chunk
+    root = COLLECTION_ROOTS[name]
+    with path.open("rb") as handle:
+        handle.seek(start)
+        raw = handle.read(end - start)
+    try:
+        value = json.loads(root + raw.decode("utf-8") + CLOSERS[root])
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if len(value) != count:
+        return None
+    errors = options.sink()
+    warnings = options.sink(budget=False)
+    try:
+        check_artifact(name, value, errors, warnings, start=first, options=options)
+    except ErrorBudgetExceeded:
+        pass
+    return options.sink(), errors, warnings
+
+
+def stream_records(path: Path, root: str) -> Iterator[tuple[Any, Any]]:
+    """Yield ``(index_or_key, record)`` pairs from a collection artifact; raises ``ValueError`` if malformed."""
+    with path.open("r", encoding="utf-8") as handle:
+        stream = JsonStream(handle)
+        if stream.peek() != root:
+            raise ValueError(f"expected root {root!r}")
+        if root == "[":
+            yield from enumerate(stream.iter_array())
+        else:
+            yield from stream.iter_object()
+
+
+def collect_ids(path: Path, name: str) -> dict[str, set[str]] | None:
+    """Collect the id sets the integrity pass joins on, keeping no record bodies.
+
+    Returns ``keys`` (top-level keys, or record ids for list artifacts with an ``id_field``),
+    ``duplicates`` (keys seen more than once), ``refs`` (assertion ids referenced by index
+    values), and ``layers`` (nested layer keys), or ``None`` when the artifact is missing or
+    unreadable; the contract checks report why.
+    """
+    if not path.exists():
+        return None
+    validator = VALIDATORS.get(name)
+    id_field = validator.id_field if validator is not None else None
+    keys: set[str] = set()
+    duplicates: set[str] = set()
+    refs: set[str] = set()
+    layers: set[str] = set()
+    try:
+        for key, record in stream_records(path, COLLECTION_ROOTS.get(name, "{")):
+            if id_field is not None:
+                key = record.get(id_field) if isinstance(record, dict) else None
+                if not isinstance(key, str):
+                    continue
+            elif COLLECTION_ROOTS.get(name, "{") == "[":
+                continue
+            if key in keys:
+                duplicates.add(key)
+            keys.add(key)
+            if name in ("assertions_by_layer.json", "assertions_by_person.json") and isinstance(record, list):
+                refs.update(x for x in record if isinstance(x, str))
+            elif name == "assertions_by_person_by_layer.json" and isinstance(record, dict):
+                for layer_id, assertion_ids in record.items():
+                    layers.add(layer_id)
+                    if isinstance(assertion_ids, list):
+                        refs.update(x for x in assertion_ids if isinstance(x, str))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return {"keys": keys, "duplicates": duplicates, "refs": refs, "layers": layers}
+
+
+def check_integrity(
+    data_dir: Path, names: list[str], errors: FindingSink, warnings: FindingSink
+) -> dict[str, dict[str, int]]:
+    """Check cross-artifact joins with hashed id sets.
+
+    Each artifact is streamed once and only ids are kept, so the pass is linear in
+    corpus size. Returns dangling/orphaned counts per join for the report.
+    """
+    ids = {name: collect_ids(data_dir / name, name) for name in names + PERSON_INDEXES if name != "manifest.json"}
+    summary: dict[str, dict[str, int]] = {}
+
+    def diff(label: str, kind: str, found: set[str], detail: str, sink: FindingSink) -> None:
+        counts = summary.setdefault(label, {"duplicate": 0} if kind == "duplicate" else {"dangling": 0, "orphaned": 0})
+        counts[kind] += len(found)
+        if found:
+            examples = ", ".join(sorted(found)[:INTEGRITY_EXAMPLES])
+            sink.append(f"{label}: {len(found)} {kind} {detail} (e.g. {examples})")
+
+    # Set sizes hide repeats, so duplicate ids are counted while streaming and reported first.
+    for name, found in ids.items():
+        if found is not None:
+            diff(name, "duplicate", found["duplicates"], "id(s)", errors)
+
+    listed = ids.get("assertions.json")
+    by_id = ids.get("assertions_by_id.json")
+    if listed is not None and by_id is not None:
+        label = "assertions.json<->assertions_by_id"
+        diff(label, "dangling", listed["keys"] - by_id["keys"], "assertion id(s) missing from assertions_by_id", errors)
+        diff(label, "orphaned", by_id["keys"] - listed["keys"], "assertion id(s) missing from assertions.json", errors)
+    known = by_id or listed
+
+    by_layer = ids.get("assertions_by_layer.json")
+    if by_layer is not None and known is not None:
+        label = "assertions_by_layer"
+        diff(label, "dangling", by_layer["refs"] - known["keys"], "assertion id(s) not in assertions_by_id", errors)
+        diff(label, "orphaned", known["keys"] - by_layer["refs"], "assertion id(s) not in any layer", warnings)
+
+    # Narrative assertions are not indexed per person, so only dangling ids count here.
+    by_person = ids.get("assertions_by_person.json")
+    if by_person is not None and known is not None:
+        label = "assertions_by_person"
+        diff(label, "dangling", by_person["refs"] - known["keys"], "assertion id(s) not in assertions_by_id", errors)
+
+    by_person_layer = ids.get("assertions_by_person_by_layer.json")
+    if by_person_layer is not None:
+        label = "assertions_by_person_by_layer"
+        if known is not None:
+            missing = by_person_layer["refs"] - known["keys"]
+            diff(label, "dangling", missing, "assertion id(s) not in assertions_by_id", errors)
+        if by_layer is not None:
+            missing = by_person_layer["layers"] - by_layer["keys"]
+            diff(label, "dangling", missing, "layer id(s) not in assertions_by_layer", errors)
+        if by_person is not None:
+            missing = by_person_layer["keys"] - by_person["keys"]
+            diff(label, "dangling", missing, "person id(s) not in assertions_by_person", errors)
+            missing = by_person["keys"] - by_person_layer["keys"]
+            diff(label, "orphaned", missing, "person id(s) from assertions_by_person missing", errors)
+
+    manifest = load_json(data_dir / "manifest.json", []) if "manifest.json" in names else None
+    if not isinstance(manifest, dict):
+        return summary
+    persons = ids.get("persons.json")
+    person_index = manifest.get("person_index")
+    if persons is not None and isinstance(person_index, dict):
+        label = "manifest.person_index"
+        diff(label, "dangling", set(person_index) - persons["keys"], "person id(s) not in persons", errors)
+        diff(label, "orphaned", persons["keys"] - set(person_index), "person id(s) from persons missing", errors)
     counts = manifest.get("counts")
-    if not isinstance(counts, dict):
-        errors.append("manifest.counts must be an object")
-    else:
-        if not isinstance(counts.get("persons"), (int, float)):
-            errors.append("manifest.counts.persons must be a number")
-        if not isinstance(counts.get("assertions"), (int, float)):
-            errors.append("manifest.counts.assertions must be a number")
-    if not isinstance(manifest.get("person_index"), dict):
-        errors.append("manifest.person_index must be an object")
+    if isinstance(counts, dict):
+        for field, found in (("persons", persons), ("assertions", known)):
+            declared = counts.get(field)
+            if found is not None and isinstance(declared, (int, float)) and declared != len(found["keys"]):
+                errors.append(f"manifest.counts.{field} is {declared} but artifacts contain {len(found['keys'])}")
+    return summary
 
 
-def check_persons(persons: Any, errors: list[str], warnings: list[str]) -> None:
-    if not require_type(persons, dict, "persons", errors):
-        return
-    for key, record in persons.items():
-        if not isinstance(record, dict):
-            errors.append(f"persons[{key}] must be an object")
-            continue
-        if not isinstance(record.get("id"), str):
-            errors.append(f"persons[{key}].id must be a string")
-        for field in ("name", "label", "type"):
-            if field in record and not isinstance(record[field], str):
-                warnings.append(f"persons[{key}].{field} should be a string when present")
+def audit_bundle(path: Path, options: AuditOptions) -> tuple[FindingSink, FindingSink]:
+    """Validate a packed bundle in place: structure, then every record against the assertion contract."""
+    from pack_artifacts import ArtifactBundle, BundleError
 
+    errors = options.sink()
+    warnings = options.sink(budget=False)
+    if not path.exists():
+        errors.append(f"Missing file: {path}")
+        return errors, warnings
+    try:
+        with ArtifactBundle(path) as bundle:
+            errors.extend(f"Invalid bundle {path}: {problem}" for problem in bundle.verify())
+            check_record = VALIDATORS["assertions_by_id.json"].record
+            for assertion_id, record in bundle.records():
+                if options.sample is None or options.sampled(assertion_id):
+                    check_record(assertion_id, record, errors, warnings)
+    except (BundleError, struct.error, UnicodeDecodeError, ValueError) as exc:
+        errors.append(f"Invalid bundle {path}: {exc}")
+    except ErrorBudgetExceeded:
+        pass
+    return errors, warnings
 
-def check_assertion_obj(assertion: Any, label: str, errors: list[str]) -> None:
-    if not isinstance(assertion, dict):
-        errors.append(f"{label} must be an object")
-        return
-    for field in ("subject", "predicate", "object"):
-        if not isinstance(assertion.get(field), str):
-            errors.append(f"{label}.{field} must be a string")
 
+def audit_neighborhoods(path: Path, data_dir: Path, options: AuditOptions) -> tuple[FindingSink, FindingSink]:
+    """Validate a neighborhood index: structure, then its assertion and layer ids against ``data_dir``."""
+    errors = options.sink()
+    warnings = options.sink(budget=False)
+    if not path.exists():
+        errors.append(f"Missing file: {path}")
+        return errors, warnings
+    # build_neighborhoods.py lives with the graph inference skill; it is loaded only for --neighborhoods.
+    neighborhoods = skill_module("graph-view-inference-rules", "build_neighborhoods")
+    try:
+        with neighborhoods.NeighborhoodIndex(path) as index:
+            errors.extend(f"Invalid neighborhood index {path}: {problem}" for problem in index.verify())
+            by_id = collect_ids(data_dir / "assertions_by_id.json", "assertions_by_id.json")
+            by_layer = collect_ids(data_dir / "assertions_by_layer.json", "assertions_by_layer.json")
+            checks = []
+            if by_id is None:
+                warnings.append(f"neighborhood index: assertion ids unchecked, no assertions_by_id in {data_dir}")
+            else:
+                checks.append(("assertion", index.assertion_ids() - by_id["keys"], "assertions_by_id"))
+            if by_layer is not None:
+                checks.append(("layer", set(index.layers) - by_layer["keys"], "assertions_by_layer"))
+            for kind, missing, source in checks:
+                if missing:
+                    examples = ", ".join(sorted(missing)[:INTEGRITY_EXAMPLES])
+                    errors.append(f"neighborhood index: {len(missing)} {kind} id(s) not in {source} (e.g. {examples})")
+    except (neighborhoods.NeighborhoodError, struct.error, UnicodeDecodeError, ValueError, KeyError) as exc:
+        errors.append(f"Invalid neighborhood index {path}: {exc}")
+    except ErrorBudgetExceeded:
+        pass
+    return errors, warnings
 
-def check_assertions(assertions: Any, errors: list[str]) -> None:
-    if not require_type(assertions, list, "assertions", errors):
-        return
-    for idx, assertion in enumerate(assertions):
-        check_assertion_obj(assertion, f"assertions[{idx}]", errors)
 
+def run_audit_task(
+    task: tuple[str, str, AuditOptions, tuple[int, int, int, int] | None]
+) -> tuple[FindingSink, FindingSink, FindingSink] | None:
+    data_dir, name, options, chunk = task
+    path = Path(data_dir) / name
+    if chunk is None:
+        return audit_file(path, name, options)
+    return audit_chunk(path, name, chunk, options)
 
-def check_assertions_by_id(assertions_by_id: Any, errors: list[str]) -> None:
-    if not require_type(assertions_by_id, dict, "assertions_by_id", errors):
-        return
-    for assertion_id, assertion in assertions_by_id.items():
-        check_assertion_obj(assertion, f"assertions_by_id[{assertion_id}]", errors)
 
+def budget_prefix(names: list[str], counts: dict[str, int], limit: int | None) -> tuple[list[str], bool]:
+    """Leading ``names`` a serial run audits, and whether ``limit`` errors were reached among them.
 
-def check_assertions_by_layer(assertions_by_layer: Any, errors: list[str]) -> None:
-    if not require_type(assertions_by_layer, dict, "assertions_by_layer", errors):
-        return
-    for layer_id, assertion_ids in assertions_by_layer.items():
-        if not isinstance(assertion_ids, list):
-            errors.append(f"assertions_by_layer[{layer_id}] must be an array")
+    ``counts`` holds the load plus contract error count of each settled artifact. The walk
+    stops after the artifact that spends the budget, or before the first one not yet settled.
+    """
+    kept: list[str] = []
+    used = 0
+    for name in names:
+        if name not in counts:
+            return kept, False
+        kept.append(name)
+        used += counts[name]
+        if limit is not None and used >= limit:
+            return kept, True
+    return kept, False
+
+
+def error_count(result: tuple[FindingSink, FindingSink, FindingSink]) -> int:
+    return len(result[0]) + len(result[1])
+
+
+def run_audit(
+    data_dir: Path,
+    names: list[str],
+    options: AuditOptions,
+    jobs: int,
+    chunk_bytes: int,
+    done: dict[str, tuple[FindingSink, FindingSink, FindingSink]] | None = None,
+) -> dict[str, tuple[FindingSink, FindingSink, FindingSink]]:
+    """Audit ``names`` not already in ``done`` and return ``(load_errors, errors, warnings)`` per artifact.
+
+    Each task stops at the error budget on its own; merging chunk results in file order
+    and truncating to the same budget gives the findings a serial run would keep. Once
+    the artifacts audited so far, in profile order, spend ``--max-errors``, the rest are
+    skipped (left out of the result) and unstarted tasks are cancelled.
+    """
+    done = done or {}
+    counts = {name: error_count(result) for name, result in done.items()}
+    tasks = []
+    for name in names:
+        if name in done:
             continue
-        for i, value in enumerate(assertion_ids):
-            if not isinstance(value, str):
-                errors.append(f"assertions_by_layer[{layer_id}][{i}] must be a string")
+        chunks = plan_chunks(data_dir / name, name, chunk_bytes) if jobs > 1 else []
+        tasks.extend((str(data_dir), name, options, chunk) for chunk in chunks or [None])
+    expected = {name: sum(1 for task in tasks if task[1] == name) for name in names if name not in done}
+
+    def settle(name: str, results: list) -> None:
+        if len(results) == expected[name] and all(r is not None for r in results):
+            counts[name] = sum(error_count(r) for r in results)
+
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        by_name: dict[str, list] = {}
+        # Both maps yield lazily in task order, so breaking off skips the remaining work.
+        stream = pool.map(run_audit_task, tasks) if pool is not None else map(run_audit_task, tasks)
+        for task, result in zip(tasks, stream):
+            by_name.setdefault(task[1], []).append(result)
+            settle(task[1], by_name[task[1]])
+            if options.max_errors is not None and budget_prefix(names, counts, options.max_errors)[1]:
+                break
+        redo = [
+            name for name, results in by_name.items()
+            if len(results) == expected[name] and any(r is None for r in results)
+        ]
+        if redo:
+            batch = [(str(data_dir), name, options, None) for name in redo]
+            whole = pool.map(run_audit_task, batch) if pool is not None else map(run_audit_task, batch)
+            for name, result in zip(redo, whole):
+                by_name[name] = [result]
+                settle(name, by_name[name])
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    kept, _ = budget_prefix(names, counts, options.max_errors)
+    merged: dict[str, tuple[FindingSink, FindingSink, FindingSink]] = {}
+    for name in kept:
+        if name in done:
+            continue
+        results = by_name[name]
+        if len(results) == 1:
+            merged[name] = results[0]
+            continue
+        combined = (options.sink(), options.sink(), options.sink(budget=False))
+        for result in results:
+            for sink, part in zip(combined, result):
+                sink.merge(part)
+        merged[name] = combined
+    return merged
+
+
+def merge_results(
+    names: list[str], results: dict[str, tuple[FindingSink, FindingSink, FindingSink]], options: AuditOptions
+) -> tuple[FindingSink, FindingSink]:
+    """Flatten per-artifact findings: every load error first, then contract errors, matching a serial run.
+
+    Artifacts after the one that spends ``--max-errors`` are left out even when their results
+    came from the cache, and the errors are then marked truncated.
+    """
+    counts = {name: error_count(result) for name, result in results.items()}
+    kept, _ = budget_prefix(names, counts, options.max_errors)
+    ordered = [results[name] for name in kept]
+    errors = options.sink()
+    warnings = options.sink(budget=False)
+    errors.truncated = len(kept) < len(names)
+    for load_errors, _, _ in ordered:
+        errors.merge(load_errors)
+    for _, check_errors, check_warnings in ordered:
+        errors.merge(check_errors)
+        warnings.merge(check_warnings)
+    return errors, warnings
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def restore_sinks(hit: Any, limits: list[int | None], aggregate: bool) -> list[FindingSink] | None:
+    """Rebuild the sinks of a cache entry, or ``None`` on a miss or an entry that cannot be reused."""
+    if hit is None:
+        return None
+    try:
+        return [FindingSink.from_json(data, limit, aggregate) for data, limit in zip(hit, limits)]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class AuditCache:
+    """On-disk audit results keyed by artifact content hash.
+
+    File size and mtime are a fast precheck: while both match the recorded values the
+    stored hash is reused without reading the file. Results are also keyed by hashes
+    of this script, the ``CACHE_MODULES`` it imports, and the contract file, so a change
+    to any of them invalidates every entry.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        scripts = Path(__file__).resolve().parent
+        sources = [Path(__file__), *(scripts / module for module in CACHE_MODULES), CONTRACT_PATH]
+        self.salt = hashlib.sha256("".join(map(file_digest, sources)).encode("ascii")).hexdigest()
+        self.files: dict[str, dict[str, Any]] = {}
+        self.results: dict[str, Any] = {}
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raw = None
+        if isinstance(raw, dict) and raw.get("version") == CACHE_VERSION and raw.get("salt") == self.salt:
+            if isinstance(raw.get("files"), dict):
+                self.files = raw["files"]
+            if isinstance(raw.get("results"), dict):
+                self.results = raw["results"]
+
+    def fingerprint(self, path: Path) -> str | None:
+        """Content hash of ``path``, or ``None`` when it does not exist."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = str(path.resolve())
+        entry = self.files.get(key)
+        if isinstance(entry, dict) and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry["sha256"]
+        digest = file_digest(path)
+        self.files[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def get(self, key: str) -> Any | None:
+        value = self.results.pop(key, None)
+        if value is not None:
+            self.results[key] = value  # keep recently used entries last for pruning
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self.results.pop(key, None)
+        self.results[key] = value
+
+    def save(self) -> None:
+        results = dict(list(self.results.items())[-CACHE_MAX_RESULTS:])
+        payload = {"version": CACHE_VERSION, "salt": self.salt, "files": self.files, "results": results}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+def findings_report(errors: FindingSink, warnings: FindingSink, options: AuditOptions) -> dict[str, Any]:
+    """Report fields for the findings, shaped by ``--aggregate``, ``--max-errors``, and ``--sample``."""
+    if options.aggregate:
+        fields: dict[str, Any] = {
+            "error_patterns": errors.pattern_report(),
+            "warning_patterns": warnings.pattern_report(),
+        }
+    else:
+        fields = {"errors": errors.messages, "warnings": warnings.messages}
+    if options.max_errors is not None:
+        fields["truncated"] = errors.truncated
+    if options.sample is not None:
+        fields["sample"] = {"rate": options.sample, "seed": options.seed}
+    return fields
 
 
 def main() -> int:
@@ -99,52 +843,156 @@ def main() -> int:
     parser.add_argument("--data-dir", default="public/data", help="Directory containing compiled artifacts")
     parser.add_argument(
         "--profile",
-        choices=("m2b", "m2c"),
+        choices=sorted(PROFILES),
         default="m2c",
         help="Artifact profile to validate",
     )
     parser.add_argument("--report", help="Optional path to write JSON report")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Validate assertion artifacts record by record with bounded memory",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for parsing and validation (0 = all cores)",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=float,
+        default=DEFAULT_CHUNK_MB,
+        help="Split collection artifacts larger than this into chunks when --jobs > 1",
+    )
+    parser.add_argument(
+        "--skip-integrity",
+        action="store_true",
+        help="Skip cross-artifact referential-integrity checks",
+    )
+    parser.add_argument(
+        "--cache",
+        help="Optional path to an audit result cache; artifacts whose content hash is unchanged are not re-audited",
+    )
+    parser.add_argument("--bundle", help="Validate a bundle written by pack_artifacts.py instead of --data-dir")
+    parser.add_argument(
+        "--neighborhoods",
+        help="Validate an index written by build_neighborhoods.py against --data-dir instead of auditing it",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        help="Stop validating once this many errors are found; the report is marked truncated",
+    )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        help="Validate only this fraction (0-1] of collection records, chosen deterministically by key",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --sample record selection")
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="Report findings as patterns with counts and example keys instead of one line per finding",
+    )
     args = parser.parse_args()
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors must be at least 1")
+    if args.sample is not None and not 0 < args.sample <= 1:
+        parser.error("--sample must be in (0, 1]")
+    options = AuditOptions(args.stream, args.max_errors, args.sample, args.seed, args.aggregate)
+
+    if args.bundle:
+        errors, warnings = audit_bundle(Path(args.bundle), options)
+        report = {
+            "bundle": args.bundle,
+            "error_count": len(errors),
+            "warning_count": len(warnings),
+        }
+        report.update(findings_report(errors, warnings, options))
+        print(json.dumps(report, indent=2))
+        if args.report:
+            Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        return 1 if errors else 0
+
+    if args.neighborhoods:
+        errors, warnings = audit_neighborhoods(Path(args.neighborhoods), Path(args.data_dir), options)
+        report = {
+            "neighborhoods": args.neighborhoods,
+            "data_dir": str(args.data_dir),
+            "error_count": len(errors),
+            "warning_count": len(warnings),
+        }
+        report.update(findings_report(errors, warnings, options))
+        print(json.dumps(report, indent=2))
+        if args.report:
+            Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        return 1 if errors else 0
 
     data_dir = Path(args.data_dir)
-    errors: list[str] = []
-    warnings: list[str] = []
-
-    required = {
-        "m2b": ["manifest.json", "persons.json", "assertions.json"],
-        "m2c": [
-            "manifest.json",
-            "persons.json",
-            "assertions.json",
-            "assertions_by_id.json",
-            "assertions_by_layer.json",
-        ],
-    }
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    names = PROFILES[args.profile]
+    cache = AuditCache(Path(args.cache)) if args.cache else None
+    results: dict[str, tuple[FindingSink, FindingSink, FindingSink]] = {}
+    cache_keys: dict[str, str] = {}
+    cached: dict[str, bool] = {}
+    if cache is not None:
+        for name in names:
+            digest = cache.fingerprint(data_dir / name)
+            if digest is None:
+                continue
+            cache_keys[name] = f"{name}|{digest}|{options}"
+            limits = [options.max_errors, options.max_errors, None]
+            sinks = restore_sinks(cache.get(cache_keys[name]), limits, options.aggregate)
+            if sinks is not None:
+                results[name] = (sinks[0], sinks[1], sinks[2])
+            cached[name] = sinks is not None
+
+    pending = [name for name in names if name not in results]
+    results.update(run_audit(data_dir, names, options, jobs, int(args.chunk_mb * 1024 * 1024), done=dict(results)))
+    if cache is not None:
+        for name in pending:
+            if name in cache_keys and name in results:
+                cache.put(cache_keys[name], [sink.to_json() for sink in results[name]])
+    errors, warnings = merge_results(names, results, options)
 
-    loaded: dict[str, Any] = {}
-    for name in required[args.profile]:
-        loaded[name] = load_json(data_dir / name, errors)
-
-    if loaded.get("manifest.json") is not None:
-        check_manifest(loaded["manifest.json"], errors)
-    if loaded.get("persons.json") is not None:
-        check_persons(loaded["persons.json"], errors, warnings)
-    if loaded.get("assertions.json") is not None:
-        check_assertions(loaded["assertions.json"], errors)
-    if args.profile == "m2c":
-        if loaded.get("assertions_by_id.json") is not None:
-            check_assertions_by_id(loaded["assertions_by_id.json"], errors)
-        if loaded.get("assertions_by_layer.json") is not None:
-            check_assertions_by_layer(loaded["assertions_by_layer.json"], errors)
+    # A spent error budget also skips the integrity pass; its summary is then null.
+    integrity = None
+    if not args.skip_integrity and not errors.truncated:
+        integrity_key = None
+        if cache is not None:
+            inputs = [f"{name}:{cache.fingerprint(data_dir / name)}" for name in names + PERSON_INDEXES]
+            digest = hashlib.sha256("\n".join(inputs).encode("utf-8")).hexdigest()
+            integrity_key = f"integrity|{digest}|aggregate={options.aggregate}"
+        hit = cache.get(integrity_key) if cache is not None and integrity_key else None
+        sinks = restore_sinks(hit and hit[:2], [None, None], options.aggregate)
+        if sinks is not None:
+            integrity_errors, integrity_warnings = sinks
+            integrity = hit[2]
+        else:
+            integrity_errors = FindingSink(None, options.aggregate)
+            integrity_warnings = FindingSink(None, options.aggregate)
+            integrity = check_integrity(data_dir, names, integrity_errors, integrity_warnings)
+            if cache is not None and integrity_key:
+                cache.put(integrity_key, [integrity_errors.to_json(), integrity_warnings.to_json(), integrity])
+        if cache is not None:
+            cached["integrity"] = sinks is not None
+        errors.merge(integrity_errors)
+        warnings.merge(integrity_warnings)
+    if cache is not None:
+        cache.save()
 
     report = {
         "data_dir": str(data_dir),
         "profile": args.profile,
         "error_count": len(errors),
         "warning_count": len(warnings),
-        "errors": errors,
-        "warnings": warnings,
     }
+    report.update(findings_report(errors, warnings, options))
+    report["integrity"] = integrity
+    if cache is not None:
+        report["cached"] = cached
 
     print(json.dumps(report, indent=2))
     if args.report:
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Incremental JSON reader for large top-level arrays and objects, using only the standard library."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator, TextIO
+
+STREAM_CHUNK_CHARS = 1 << 16
+JSON_WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JsonStream:
+    """Incremental reader over a top-level JSON array or object.
+
+    Records are decoded one at a time with ``json.JSONDecoder.raw_decode`` on a
+    sliding text buffer, so memory is bounded by the largest single record
+    rather than the artifact size.
+    """
+
+    def __init__(self, handle: TextIO, chunk_chars: int = STREAM_CHUNK_CHARS) -> None:
+        self.handle = handle
+        self.chunk_chars = chunk_chars
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        # Position bookkeeping for text already dropped from the buffer.
+        self.offset = 0
+        self.line = 1
+        self.line_start = 0
+
+    def _fill(self) -> None:
+        if self.pos:
+            dropped = self.buf[: self.pos]
+            newlines = dropped.count("\n")
+            if newlines:
+                self.line += newlines
+                self.line_start = self.offset + dropped.rfind("\n") + 1
+            self.offset += self.pos
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+        chunk = self.handle.read(max(self.chunk_chars, len(self.buf)))
+        if chunk:
+            self.buf += chunk
+        else:
+            self.eof = True
+
+    def error(self, msg: str) -> ValueError:
+        pos = self.pos
+        line = self.line + self.buf.count("\n", 0, pos)
+        last_newline = self.buf.rfind("\n", 0, pos)
+        if last_newline >= 0:
+            column = pos - last_newline
+        else:
+            column = self.offset + pos - self.line_start + 1
+        return ValueError(f"{msg}: line {line} column {column} (char {self.offset + pos})")
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, char: str, msg: str) -> None:
+        if self.peek() != char:
+            raise self.error(msg)
+        self.pos += 1
+
+    def value(self) -> Any:
+        if not self.peek():
+            raise self.error("Expecting value")
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as exc:
+                truncated = exc.pos >= len(self.buf) - 6 or exc.msg.startswith("Unterminated string")
+                if self.eof or not truncated:
+                    self.pos = exc.pos
+                    raise self.error(exc.msg) from None
+                self._fill()
+                continue
+            # A number near the buffer edge may continue in the next chunk ("12" of "12.5e3").
+            if not self.eof and (
+                end == len(self.buf)
+                or (
+                    isinstance(value, (int, float))
+                    and len(self.buf) - end < 32
+                    and self.buf[end] in NUMBER_CHARS
+                )
+            ):
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def _finish(self) -> None:
+        if self.peek():
+            raise self.error("Extra data")
+
+    def iter_elements(self) -> Iterator[Any]:
+        """Yield the elements of the array at the current position, which may be nested."""
+        self.expect("[", "Expecting value")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]", "Expecting ',' delimiter")
+            break
+
+    def iter_array(self) -> Iterator[Any]:
+        yield from self.iter_elements()
+        self._finish()
+
+    def iter_object(self) -> Iterator[tuple[str, Any]]:
+        self.expect("{", "Expecting value")
+        if self.peek() == "}":
+            self.pos += 1
+        else:
+            while True:
+                if self.peek() != '"':
+                    raise self.error("Expecting property name enclosed in double quotes")
+                key = self.value()
+                self.expect(":", "Expecting ':' delimiter")
+                yield key, self.value()
+                if self.peek() == ",":
+                    self.pos += 1
+                    continue
+                self.expect("}", "Expecting ',' delimiter")
+                break
+        self._finish()
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""Pack compiled assertion artifacts into a deduplicated, memory-mappable binary bundle."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Iterator
+
+MAGIC = b"PSBUNDLE"
+VERSION = 1
+
+# Section order in the header table; each entry is (u64 offset, u64 length).
+SECTIONS = (
+    "meta",
+    "string_offsets",
+    "string_data",
+    "records",
+    "id_index",
+    "order",
+    "layer_index",
+    "layer_postings",
+    "person_index",
+    "person_postings",
+)
+SOURCE_FILES = ("assertions.json", "assertions_by_id.json", "assertions_by_layer.json", "assertions_by_person.json")
+HEADER = struct.Struct("<8sII")
+SECTION = struct.Struct("<QQ")
+HEADER_SIZE = HEADER.size + SECTION.size * len(SECTIONS)
+
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+I64 = struct.Struct("<q")
+F64 = struct.Struct("<d")
+ID_ENTRY = struct.Struct("<IQ")  # id string, record offset
+POSTING_ENTRY = struct.Struct("<IQI")  # key string, first posting, posting count
+
+# Value tags. Containers live in the record blob and are referenced inline with TAG_REF,
+# so identical sub-objects (provenance blocks, raw copies) are stored once.
+TAG_NULL, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STR, TAG_ARRAY, TAG_OBJECT, TAG_REF = range(9)
+# Deepest container nesting the packer writes and the reader follows; far above any artifact record,
+# well inside the interpreter's recursion limit.
+MAX_NESTING = 128
+
+
+class BundleError(ValueError):
+    """Raised when a bundle is malformed or cannot be built."""
+
+
+class BundleWriter:
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.blob = bytearray()
+        self.containers: dict[bytes, int] = {}
+        self.reused = 0
+
+    def intern(self, text: str) -> int:
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def put(self, encoded: bytes) -> int:
+        offset = self.containers.get(encoded)
+        if offset is not None:
+            self.reused += 1
+            return offset
+        offset = self.containers[encoded] = len(self.blob)
+        self.blob += encoded
+        return offset
+
+    def inline(self, value: Any, depth: int = 0) -> bytes:
+        if value is None:
+            return bytes((TAG_NULL,))
+        if value is True:
+            return bytes((TAG_TRUE,))
+        if value is False:
+            return bytes((TAG_FALSE,))
+        if isinstance(value, int):
+            if not -(1 << 63) <= value < (1 << 63):
+                raise BundleError(f"integer out of 64-bit range: {value}")
+            return bytes((TAG_INT,)) + I64.pack(value)
+        if isinstance(value, float):
+            return bytes((TAG_FLOAT,)) + F64.pack(value)
+        if isinstance(value, str):
+            return bytes((TAG_STR,)) + U32.pack(self.intern(value))
+        return bytes((TAG_REF,)) + U64.pack(self.container(value, depth + 1))
+
+    def container(self, value: Any, depth: int = 0) -> int:
+        """Store ``value`` after its children, so every ``TAG_REF`` points strictly backwards in the blob."""
+        if depth >= MAX_NESTING:
+            raise BundleError(f"value nested deeper than {MAX_NESTING} containers")
+        if isinstance(value, list):
+            body = b"".join(self.inline(item, depth) for item in value)
+            return self.put(bytes((TAG_ARRAY,)) + U32.pack(len(value)) + body)
+        if isinstance(value, dict):
+            body = b"".join(U32.pack(self.intern(key)) + self.inline(item, depth) for key, item in value.items())
+            return self.put(bytes((TAG_OBJECT,)) + U32.pack(len(value)) + body)
+        raise BundleError(f"unsupported value type: {type(value).__name__}")
+
+    def string_sections(self) -> tuple[bytes, bytes]:
+        data = bytearray()
+        offsets = [0]
+        for text in self.strings:
+            data += text.encode("utf-8")
+            offsets.append(len(data))
+        return struct.pack(f"<{len(offsets)}Q", *offsets), bytes(data)
+
+
+def posting_sections(
+    writer: BundleWriter, index: dict[str, list[str]], ordinals: dict[str, int], label: str
+) -> tuple[bytes, bytes]:
+    entries = bytearray()
+    postings: list[int] = []
+    for key in sorted(index, key=lambda k: k.encode("utf-8")):
+        ids = index[key]
+        missing = [x for x in ids if x not in ordinals]
+        if missing:
+            raise BundleError(f"{label}[{key}] references unknown assertion id {missing[0]}")
+        entries += POSTING_ENTRY.pack(writer.intern(key), len(postings), len(ids))
+        postings.extend(ordinals[x] for x in ids)
+    return bytes(entries), struct.pack(f"<{len(postings)}I", *postings)
+
+
+def build_bundle(data_dir: Path) -> tuple[bytes, dict[str, Any]]:
+    """Pack ``data_dir`` and return the bundle bytes plus a summary for the report."""
+
+    def load(name: str, default: Any = None) -> Any:
+        path = data_dir / name
+        if not path.exists():
+            if default is None:
+                raise BundleError(f"Missing file: {path}")
+            return default
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    by_id = load("assertions_by_id.json")
+    listed = load("assertions.json")
+    by_layer = load("assertions_by_layer.json")
+    by_person = load("assertions_by_person.json", {})
+    manifest = load("manifest.json", {})
+    if not isinstance(by_id, dict) or not isinstance(listed, list):
+        raise BundleError("assertions_by_id.json must be an object and assertions.json an array")
+    if not isinstance(by_layer, dict) or not isinstance(by_person, dict):
+        raise BundleError("assertions_by_layer.json and assertions_by_person.json must be objects")
+
+    # assertions.json repeats assertions_by_id; keep one copy and only its order.
+    ids = sorted(by_id, key=lambda k: k.encode("utf-8"))
+    ordinals = {assertion_id: i for i, assertion_id in enumerate(ids)}
+    order: list[int] = []
+    for idx, record in enumerate(listed):
+        assertion_id = record.get("id") if isinstance(record, dict) else None
+        if assertion_id not in ordinals or by_id[assertion_id] != record:
+            raise BundleError(f"assertions[{idx}] does not match an assertions_by_id entry")
+        order.append(ordinals[assertion_id])
+
+    writer = BundleWriter()
+    id_index = bytearray()
+    for assertion_id in ids:
+        record = by_id[assertion_id]
+        if not isinstance(record, (dict, list)):
+            raise BundleError(f"assertions_by_id[{assertion_id}] must be an object")
+        id_index += ID_ENTRY.pack(writer.intern(assertion_id), writer.container(record))
+    layer_index, layer_postings = posting_sections(writer, by_layer, ordinals, "assertions_by_layer")
+    person_index, person_postings = posting_sections(writer, by_person, ordinals, "assertions_by_person")
+    string_offsets, string_data = writer.string_sections()
+
+    meta = {
+        "spec_version": manifest.get("spec_version") if isinstance(manifest, dict) else None,
+        "assertion_count": len(ids),
+        "layer_count": len(by_layer),
+        "person_count": len(by_person),
+        "string_count": len(writer.strings),
+    }
+    payloads = {
+        "meta": json.dumps(meta, sort_keys=True).encode("utf-8"),
+        "string_offsets": string_offsets,
+        "string_data": string_data,
+        "records": bytes(writer.blob),
+        "id_index": bytes(id_index),
+        "order": struct.pack(f"<{len(order)}I", *order),
+        "layer_index": layer_index,
+        "layer_postings": layer_postings,
+        "person_index": person_index,
+        "person_postings": person_postings,
+    }
+    table = bytearray(HEADER.pack(MAGIC, VERSION, len(SECTIONS)))
+    body = bytearray()
+    for name in SECTIONS:
+        # 8-byte alignment keeps struct reads over the mapping aligned.
+        body += b"\0" * (-(HEADER_SIZE + len(body)) % 8)
+        table += SECTION.pack(HEADER_SIZE + len(body), len(payloads[name]))
+        body += payloads[name]
+    bundle = bytes(table + body)
+
+    summary = dict(meta)
+    summary.update(
+        {
+            "bundle_bytes": len(bundle),
+            "source_bytes": sum((data_dir / name).stat().st_size for name in SOURCE_FILES if (data_dir / name).exists()),
+            "record_bytes": len(writer.blob),
+            "shared_containers": writer.reused,
+        }
+    )
+    return bundle, summary
+
+
+class ArtifactBundle:
+    """Read-only view over a packed bundle through ``mmap``.
+
+    Lookups binary-search the sorted id index and decode only the requested record.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            try:
+                self.data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise BundleError(f"cannot map {path}: {exc}") from None
+        try:
+            self.read_header()
+        except BaseException:
+            self.data.close()
+            raise
+
+    def read_header(self) -> None:
+        if len(self.data) < HEADER_SIZE:
+            raise BundleError("file is shorter than the bundle header")
+        magic, version, count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise BundleError("bad magic")
+        if version != VERSION or count != len(SECTIONS):
+            raise BundleError(f"unsupported bundle version {version} with {count} sections")
+        self.sections: dict[str, tuple[int, int]] = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(self.data, HEADER.size + i * SECTION.size)
+            if offset + length > len(self.data):
+                raise BundleError(f"section {name} runs past end of file")
+            self.sections[name] = (offset, length)
+        self.meta = json.loads(self.section("meta").decode("utf-8"))
+        if not isinstance(self.meta, dict):
+            raise BundleError("meta section is not an object")
+        self.string_count = self.sections["string_offsets"][1] // U64.size - 1
+        self.count = self.sections["id_index"][1] // ID_ENTRY.size
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __enter__(self) -> ArtifactBundle:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def section(self, name: str) -> bytes:
+        offset, length = self.sections[name]
+        return self.data[offset : offset + length]
+
+    def string(self, index: int) -> str:
+        if not 0 <= index < self.string_count:
+            raise BundleError(f"string index {index} out of range")
+        base = self.sections["string_offsets"][0] + index * U64.size
+        start, end = struct.unpack_from("<QQ", self.data, base)
+        data_at, data_len = self.sections["string_data"]
+        if not start <= end <= data_len:
+            raise BundleError(f"string {index} spans {start}..{end} outside the string data")
+        return self.data[data_at + start : data_at + end].decode("utf-8")
+
+    def entry(self, ordinal: int) -> tuple[str, int]:
+        if not 0 <= ordinal < self.count:
+            raise BundleError(f"ordinal {ordinal} out of range")
+        at = self.sections["id_index"][0] + ordinal * ID_ENTRY.size
+        string_index, offset = ID_ENTRY.unpack_from(self.data, at)
+        return self.string(string_index), offset
+
+    def find(self, assertion_id: str) -> int | None:
+        """Ordinal of ``assertion_id`` in the id index, by binary search over UTF-8 bytes."""
+        target = assertion_id.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = self.entry(mid)[0].encode("utf-8")
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def get(self, assertion_id: str) -> Any | None:
+        ordinal = self.find(assertion_id)
+        return None if ordinal is None else self.record(ordinal)
+
+    def record(self, ordinal: int) -> Any:
+        return self.decode_container(self.entry(ordinal)[1])
+
+    def records(self) -> Iterator[tuple[str, Any]]:
+        for ordinal in range(self.count):
+            assertion_id, offset = self.entry(ordinal)
+            yield assertion_id, self.decode_container(offset)
+
+    def ordered_ids(self) -> list[str]:
+        """Assertion ids in the original ``assertions.json`` order."""
+        offset, length = self.sections["order"]
+        ordinals = struct.unpack_from(f"<{length // U32.size}I", self.data, offset)
+        return [self.entry(ordinal)[0] for ordinal in ordinals]
+
+    def posting_ordinals(self, kind: str, first: int, count: int) -> tuple[int, ...]:
+        postings_at, postings_len = self.sections[f"{kind}_postings"]
+        if first + count > postings_len // U32.size:
+            raise BundleError(f"{kind} postings {first}+{count} run past the postings section")
+        return struct.unpack_from(f"<{count}I", self.data, postings_at + first * U32.size)
+
+    def postings(self, kind: str) -> Iterator[tuple[str, list[int]]]:
+        """Yield ``(key, ordinals)`` for ``kind`` ``layer`` or ``person``, sorted by key."""
+        index_at, index_len = self.sections[f"{kind}_index"]
+        for i in range(index_len // POSTING_ENTRY.size):
+            string_index, first, count = POSTING_ENTRY.unpack_from(self.data, index_at + i * POSTING_ENTRY.size)
+            yield self.string(string_index), list(self.posting_ordinals(kind, first, count))
+
+    def posting_ids(self, kind: str, key: str) -> list[str] | None:
+        """Assertion ids posted under ``key`` for ``kind`` ``layer`` or ``person``, by binary search."""
+        index_at, index_len = self.sections[f"{kind}_index"]
+        target = key.encode("utf-8")
+        lo, hi = 0, index_len // POSTING_ENTRY.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            string_index, first, count = POSTING_ENTRY.unpack_from(self.data, index_at + mid * POSTING_ENTRY.size)
+            found = self.string(string_index).encode("utf-8")
+            if found < target:
+                lo = mid + 1
+            elif found > target:
+                hi = mid
+            else:
+                return [self.entry(o)[0] for o in self.posting_ordinals(kind, first, count)]
+        return None
+
+    def decode_container(self, offset: int, parent: int | None = None, depth: int = 0) -> Any:
+        """Decode the container at ``offset``; references from a ``parent`` must point strictly before it."""
+        records_at, records_len = self.sections["records"]
+        if not 0 <= offset < records_len:
+            raise BundleError(f"record offset {offset} out of range")
+        if parent is not None and offset >= parent:
+            raise BundleError(f"record offset {offset} referenced from {parent} does not point backwards")
+        if depth >= MAX_NESTING:
+            raise BundleError(f"record at offset {offset} nests deeper than {MAX_NESTING} containers")
+        pos = records_at + offset
+        tag = self.data[pos]
+        (count,) = U32.unpack_from(self.data, pos + 1)
+        pos += 5
+        if tag == TAG_ARRAY:
+            items = []
+            for _ in range(count):
+                value, pos = self.decode_inline(pos, offset, depth)
+                items.append(value)
+            return items
+        if tag == TAG_OBJECT:
+            obj = {}
+            for _ in range(count):
+                (key,) = U32.unpack_from(self.data, pos)
+                obj[self.string(key)], pos = self.decode_inline(pos + 4, offset, depth)
+            return obj
+        raise BundleError(f"unexpected container tag {tag} at record offset {offset}")
+
+    def decode_inline(self, pos: int, parent: int, depth: int) -> tuple[Any, int]:
+        records_at, records_len = self.sections["records"]
+        if pos >= records_at + records_len:
+            raise BundleError(f"record at offset {parent} runs past the records section")
+        tag = self.data[pos]
+        pos += 1
+        if tag == TAG_NULL:
+            return None, pos
+        if tag == TAG_TRUE:
+            return True, pos
+        if tag == TAG_FALSE:
+            return False, pos
+        if tag == TAG_INT:
+            return I64.unpack_from(self.data, pos)[0], pos + 8
+        if tag == TAG_FLOAT:
+            return F64.unpack_from(self.data, pos)[0], pos + 8
+        if tag == TAG_STR:
+            return self.string(U32.unpack_from(self.data, pos)[0]), pos + 4
+        if tag == TAG_REF:
+            return self.decode_container(U64.unpack_from(self.data, pos)[0], parent, depth + 1), pos + 8
+        raise BundleError(f"unexpected value tag {tag}")
+
+    def verify(self) -> list[str]:
+        """Structural checks: sorted unique ids, in-range offsets and postings."""
+        problems: list[str] = []
+        previous = b""
+        for ordinal in range(self.count):
+            try:
+                assertion_id, _ = self.entry(ordinal)
+            except BundleError as exc:
+                problems.append(f"id_index[{ordinal}]: {exc}")
+                continue
+            key = assertion_id.encode("utf-8")
+            if ordinal and key <= previous:
+                problems.append(f"id_index[{ordinal}] is not sorted after {previous.decode('utf-8')}")
+            previous = key
+        for kind in ("layer", "person"):
+            try:
+                for key, ordinals in self.postings(kind):
+                    bad = [o for o in ordinals if o >= self.count]
+                    if bad:
+                        problems.append(f"{kind} postings [{key}] reference {len(bad)} ordinal(s) past the id index")
+            except (BundleError, struct.error) as exc:
+                problems.append(f"{kind} postings unreadable: {exc}")
+        if self.meta.get("assertion_count") != self.count:
+            declared = self.meta.get("assertion_count")
+            problems.append(f"meta.assertion_count is {declared} but id index holds {self.count}")
+        return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default="public/data", help="Directory containing compiled artifacts")
+    parser.add_argument("--out", help="Bundle path to write")
+    parser.add_argument("--bundle", help="Existing bundle to read (with --lookup)")
+    parser.add_argument("--lookup", action="append", default=[], help="Assertion id to print from --bundle")
+    parser.add_argument("--report", help="Optional path to write JSON report")
+    args = parser.parse_args()
+
+    if args.lookup:
+        if not args.bundle:
+            parser.error("--lookup requires --bundle")
+        try:
+            with ArtifactBundle(Path(args.bundle)) as bundle:
+                result: dict[str, Any] = {assertion_id: bundle.get(assertion_id) for assertion_id in args.lookup}
+        except (BundleError, ValueError, struct.error) as exc:
+            print(json.dumps({"bundle": args.bundle, "error_count": 1, "errors": [str(exc)]}, indent=2))
+            return 1
+        print(json.dumps(result, indent=2))
+        return 0 if all(value is not None for value in result.values()) else 1
+
+    if not args.out:
+        parser.error("--out is required when packing")
+    errors: list[str] = []
+    summary: dict[str, Any] = {}
+    try:
+        bundle, summary = build_bundle(Path(args.data_dir))
+    except (BundleError, ValueError) as exc:
+        errors.append(str(exc))
+    else:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_bytes(bundle)
+
+    report = {
+        "data_dir": str(args.data_dir),
+        "out": str(args.out),
+        "error_count": len(errors),
+        "errors": errors,
+        "summary": summary,
+    }
+    payload = json.dumps(report, indent=2)
+    print(payload)
+    if args.report:
+        Path(args.report).write_text(payload, encoding="utf-8")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""Precompute quadkey-addressed point clusters per zoom level for the map view."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable
+
+from validate_scale_model import in_geodetic_bounds, read_points
+
+VERSION = 1
+# Web Mercator cannot represent the poles; points beyond this latitude are clamped onto the edge tiles.
+MERCATOR_MAX_LAT = 85.05112878
+# Each tile is split into 2**CELL_BITS x 2**CELL_BITS clustering cells.
+DEFAULT_CELL_BITS = 3
+DEFAULT_MIN_TILE_KM = 5.0
+ZOOM_CAP = 20
+
+
+class TileError(ValueError):
+    """Raised when tiles cannot be built or a tile set is malformed."""
+
+
+def mercator_fraction(lat: float, lon: float) -> tuple[float, float]:
+    """Position of a point in the unit Web Mercator square, x eastwards and y southwards."""
+    lat = max(-MERCATOR_MAX_LAT, min(MERCATOR_MAX_LAT, lat))
+    sin_lat = math.sin(math.radians(lat))
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+def quadkey(x: int, y: int, zoom: int) -> str:
+    digits = []
+    for level in range(zoom, 0, -1):
+        mask = 1 << (level - 1)
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return "".join(digits)
+
+
+def quadkey_tile(key: str) -> tuple[int, int, int]:
+    """``(x, y, zoom)`` of a quadkey."""
+    x = y = 0
+    for digit in key:
+        if digit not in "0123":
+            raise TileError(f"invalid quadkey {key!r}")
+        x, y = x * 2 + (digit in "13"), y * 2 + (digit in "23")
+    return x, y, len(key)
+
+
+def tile_bbox(x: int, y: int, zoom: int) -> list[float]:
+    """``[west, south, east, north]`` of a tile in degrees."""
+    size = 1 << zoom
+
+    def lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / size))))
+
+    return [x / size * 360.0 - 180.0, lat(y + 1), (x + 1) / size * 360.0 - 180.0, lat(y)]
+
+
+def tile_file(tiles_dir: Path, zoom: int, key: str) -> Path:
+    return tiles_dir / f"z{zoom}" / f"{key or 'root'}.json"
+
+
+def tile_path(out_dir: Path, zoom: int, key: str) -> Path:
+    return tile_file(out_dir / "tiles", zoom, key)
+
+
+def owns_tiles(out_dir: Path) -> bool:
+    """Whether ``out_dir/tiles`` sits next to a manifest written by this tool, so it may be replaced."""
+    try:
+        manifest = json.loads((out_dir / "tiles.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return isinstance(manifest, dict) and "version" in manifest and isinstance(manifest.get("zooms"), list)
+
+
+def tile_km(radius_km: float, zoom: int) -> float:
+    """Equatorial width of one tile at ``zoom`` on a world of ``radius_km``."""
+    return 2 * math.pi * radius_km / (1 << zoom)
+
+
+def zoom_limit(radius_km: float, min_tile_km: float) -> int:
+    """Deepest zoom worth building: the first whose tiles are no wider than ``min_tile_km``.
+
+    Tiles cover a fixed share of the globe, so a smaller constructed world reaches the same
+    ground detail at a shallower zoom than Earth does.
+    """
+    zoom = 0
+    while zoom < ZOOM_CAP and tile_km(radius_km, zoom) > min_tile_km:
+        zoom += 1
+    return zoom
+
+
+def cluster_cells(
+    places: list[dict[str, Any]], cells: list[tuple[int, int]], shift: int, zoom: int, cell_bits: int
+) -> dict[str, list[dict[str, Any]]]:
+    """Clusters per tile quadkey at ``zoom``; ``cells`` are pixel positions at the deepest level."""
+    members: dict[tuple[int, int], list[int]] = {}
+    for index, (x, y) in enumerate(cells):
+        members.setdefault((x >> shift, y >> shift), []).append(index)
+    tiles: dict[str, list[dict[str, Any]]] = {}
+    for (cell_x, cell_y), indexes in sorted(members.items()):
+        lat = sum(places[i]["lat"] for i in indexes) / len(indexes)
+        lon = sum(places[i]["lon"] for i in indexes) / len(indexes)
+        # The representative is the member nearest the centroid; ids break ties so reruns agree.
+        nearest = min(
+            indexes,
+            key=lambda i: ((places[i]["lat"] - lat) ** 2 + (places[i]["lon"] - lon) ** 2, str(places[i]["id"])),
+        )
+        cell_key = quadkey(cell_x, cell_y, zoom + cell_bits)
+        tiles.setdefault(cell_key[:zoom], []).append(
+            {
+                "id": f"{zoom}/{cell_key}",
+                "count": len(indexes),
+                "lat": round(lat, 6),
+                "lon": round(lon, 6),
+                "representative": places[nearest],
+            }
+        )
+    return tiles
+
+
+def build_tiles(
+    points: Iterable[Any],
+    out_dir: Path,
+    radius_km: float,
+    reference_radius_km: float,
+    min_tile_km: float = DEFAULT_MIN_TILE_KM,
+    cell_bits: int = DEFAULT_CELL_BITS,
+    max_zoom: int | None = None,
+) -> dict[str, Any]:
+    """Write ``tiles.json`` and one file per non-empty tile under ``out_dir``; return the manifest.
+
+    Zoom levels stop at the world-scaled ``zoom_limit`` or earlier, once every cluster holds a
+    single place, because deeper tiles would only repeat the same markers. Tiles are written to a
+    staging directory and swapped in at the end; an existing ``out_dir/tiles`` is only replaced
+    when it belongs to an earlier build.
+    """
+    tiles_dir = out_dir / "tiles"
+    if tiles_dir.exists() and not owns_tiles(out_dir):
+        raise TileError(f"refusing to replace {tiles_dir}: it has no tiles.json from an earlier build next to it")
+    places: list[dict[str, Any]] = []
+    skipped = {"invalid": 0, "out_of_bounds": 0}
+    for point in points:
+        lat = point.get("lat") if isinstance(point, dict) else None
+        lon = point.get("lon") if isinstance(point, dict) else None
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)) or lat != lat or lon != lon:
+            skipped["invalid"] += 1
+        elif not in_geodetic_bounds(lat, lon):
+            skipped["out_of_bounds"] += 1
+        else:
+            places.append({"id": point.get("id"), "name": point.get("name"), "lat": float(lat), "lon": float(lon)})
+
+    limit = zoom_limit(radius_km, min_tile_km) if max_zoom is None else max_zoom
+    depth = limit + cell_bits
+    size = 1 << depth
+    cells = []
+    for place in places:
+        x, y = mercator_fraction(place["lat"], place["lon"])
+        cells.append((min(int(x * size), size - 1), min(int(y * size), size - 1)))
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".tiles-", dir=out_dir))
+    try:
+        zooms = []
+        for zoom in range(limit + 1):
+            tiles = cluster_cells(places, cells, depth - zoom - cell_bits, zoom, cell_bits)
+            for key, clusters in tiles.items():
+                x, y, _ = quadkey_tile(key)
+                path = tile_file(staging, zoom, key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tile = {
+                    "zoom": zoom,
+                    "quadkey": key,
+                    "bbox": [round(value, 6) for value in tile_bbox(x, y, zoom)],
+                    "count": sum(cluster["count"] for cluster in clusters),
+                    "clusters": clusters,
+                }
+                path.write_text(json.dumps(tile, separators=(",", ":")), encoding="utf-8")
+            cluster_count = sum(len(clusters) for clusters in tiles.values())
+            zooms.append(
+                {
+                    "zoom": zoom,
+                    "tile_km": round(tile_km(radius_km, zoom), 3),
+                    "tiles": len(tiles),
+                    "clusters": cluster_count,
+                }
+            )
+            if cluster_count == len(places):
+                break
+        if tiles_dir.exists():
+            previous = staging.with_name(staging.name + "-previous")
+            tiles_dir.rename(previous)
+            staging.rename(tiles_dir)
+            shutil.rmtree(previous)
+        else:
+            staging.rename(tiles_dir)
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging)
+
+    manifest = {
+        "version": VERSION,
+        "world": {
+            "radius_km": radius_km,
+            "reference_radius_km": reference_radius_km,
+            "scale_modifier": radius_km / reference_radius_km,
+        },
+        "cell_bits": cell_bits,
+        "min_tile_km": min_tile_km,
+        "max_zoom": zooms[-1]["zoom"],
+        "place_count": len(places),
+        "skipped": skipped,
+        "zooms": zooms,
+    }
+    (out_dir / "tiles.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def check_bbox(bbox: list[float]) -> None:
+    west, south, east, north = bbox
+    if not all(-180.0 <= lon <= 180.0 for lon in (west, east)) or not -90.0 <= south <= north <= 90.0:
+        raise TileError(
+            f"bbox {bbox} must have longitudes in [-180, 180] and -90 <= south <= north <= 90; "
+            "west > east means the viewport crosses the antimeridian"
+        )
+
+
+def lon_spans(west: float, east: float) -> list[tuple[float, float]]:
+    """Longitude ranges of a viewport; one crossing the antimeridian (``west > east``) is split in two."""
+    return [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+
+
+def in_viewport(lat: float, lon: float, bbox: list[float]) -> bool:
+    west, south, east, north = bbox
+    return south <= lat <= north and any(low <= lon <= high for low, high in lon_spans(west, east))
+
+
+def viewport_tiles(out_dir: Path, manifest: dict[str, Any], bbox: list[float], zoom: int) -> tuple[int, list[str]]:
+    """Zoom actually served and the tile quadkeys intersecting ``[west, south, east, north]``.
+
+    Requests deeper than the built ``max_zoom`` are answered from the deepest level.
+    """
+    west, south, east, north = bbox
+    zoom = max(0, min(zoom, manifest["max_zoom"]))
+    tiles_dir = tile_path(out_dir, zoom, "").parent
+    size = 1 << zoom
+    columns = []
+    for low, high in lon_spans(west, east):
+        left, right = mercator_fraction(0.0, low)[0], mercator_fraction(0.0, high)[0]
+        columns.append(range(int(left * size), min(int(right * size), size - 1) + 1))
+    top, bottom = mercator_fraction(north, 0.0)[1], mercator_fraction(south, 0.0)[1]
+    rows = range(int(top * size), min(int(bottom * size), size - 1) + 1)
+    if sum(map(len, columns)) * len(rows) > manifest["zooms"][zoom]["tiles"]:
+        # A wide viewport at a deep zoom covers more tiles than exist; filter the built ones instead.
+        built = [quadkey_tile(path.stem if path.stem != "root" else "") for path in tiles_dir.glob("*.json")]
+        return zoom, sorted(
+            quadkey(x, y, zoom) for x, y, _ in built if y in rows and any(x in span for span in columns)
+        )
+    # At shallow zooms both halves of an antimeridian viewport can land in the same column.
+    unique_columns = dict.fromkeys(x for span in columns for x in span)
+    return zoom, [quadkey(x, y, zoom) for y in rows for x in unique_columns]
+
+
+def query_viewport(out_dir: Path, bbox: list[float], zoom: int) -> dict[str, Any]:
+    """Clusters inside ``bbox``, read only from the tiles that cover it."""
+    check_bbox(bbox)
+    manifest = json.loads((out_dir / "tiles.json").read_text(encoding="utf-8"))
+    if manifest.get("version") != VERSION:
+        raise TileError(f"unsupported tile set version {manifest.get('version')!r}")
+    served, keys = viewport_tiles(out_dir, manifest, bbox, zoom)
+    # Only non-empty tiles are written, so a missing file is an empty tile.
+    keys = [key for key in keys if tile_path(out_dir, served, key).exists()]
+    clusters = []
+    for key in keys:
+        tile = json.loads(tile_path(out_dir, served, key).read_text(encoding="utf-8"))
+        clusters.extend(cluster for cluster in tile["clusters"] if in_viewport(cluster["lat"], cluster["lon"], bbox))
+    return {"zoom": served, "tiles": keys, "count": sum(c["count"] for c in clusters), "clusters": clusters}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--config", help="World config JSON supplying radius_km and reference_radius_km")
+    parser.add_argument(
+        "--points",
+        default="public/data/location_coordinates.json",
+        help="Places to tile: GeoJSON, NDJSON or location_coordinates.json (see validate_scale_model.py)",
+    )
+    parser.add_argument(
+        "--points-format",
+        choices=("auto", "json", "ndjson"),
+        default="auto",
+        help="Format of --points",
+    )
+    parser.add_argument("--out", help="Directory to write tiles.json and tiles/ into")
+    parser.add_argument(
+        "--min-tile-km",
+        type=float,
+        default=DEFAULT_MIN_TILE_KM,
+        help="Stop zooming once tiles are this narrow on the constructed world",
+    )
+    parser.add_argument("--max-zoom", type=int, help="Fixed deepest zoom instead of the world-scaled limit")
+    parser.add_argument(
+        "--cell-bits",
+        type=int,
+        default=DEFAULT_CELL_BITS,
+        help="Clustering cells per tile side as a power of two",
+    )
+    parser.add_argument("--tiles", help="Existing tile directory to query (with --bbox)")
+    parser.add_argument("--bbox", help="Viewport west,south,east,north in degrees")
+    parser.add_argument("--zoom", type=int, default=0, help="Viewport zoom for --bbox")
+    parser.add_argument("--report", help="Optional path to write JSON report")
+    args = parser.parse_args()
+
+    if args.bbox:
+        if not args.tiles:
+            parser.error("--bbox requires --tiles")
+        try:
+            bbox = [float(value) for value in args.bbox.split(",")]
+        except ValueError:
+            bbox = []
+        if len(bbox) != 4:
+            parser.error("--bbox must be four numbers: west,south,east,north")
+        try:
+            result = query_viewport(Path(args.tiles), bbox, args.zoom)
+        except TileError as exc:
+            parser.error(str(exc))
+        print(json.dumps(result, indent=2))
+        return 0
+
+    if not args.out or not args.config:
+        parser.error("--out and --config are required when building")
+    if not 0 <= args.cell_bits <= 8 or args.min_tile_km <= 0:
+        parser.error("--cell-bits must be 0-8 and --min-tile-km positive")
+    if args.max_zoom is not None and not 0 <= args.max_zoom <= ZOOM_CAP:
+        parser.error(f"--max-zoom must be 0-{ZOOM_CAP}")
+
+    errors: list[str] = []
+    summary: dict[str, Any] = {}
+    world = json.loads(Path(args.config).read_text(encoding="utf-8")).get("world")
+    world = world if isinstance(world, dict) else {}
+    radius, reference = world.get("radius_km"), world.get("reference_radius_km")
+    if not all(isinstance(value, (int, float)) and value > 0 for value in (radius, reference)):
+        errors.append("world.radius_km and world.reference_radius_km must be positive numbers")
+    else:
+        try:
+            manifest = build_tiles(
+                read_points(Path(args.points), args.points_format),
+                Path(args.out),
+                float(radius),
+                float(reference),
+                args.min_tile_km,
+                args.cell_bits,
+                args.max_zoom,
+            )
+        except (OSError, ValueError) as exc:
+            errors.append(str(exc))
+        else:
+            summary = manifest
+
+    report = {
+        "points": str(args.points),
+        "out": str(args.out),
+        "error_count": len(errors),
+        "errors": errors,
+        "summary": summary,
+    }
+    payload = json.dumps(report, indent=2)
+    print(payload)
+    if args.report:
+        Path(args.report).write_text(payload, encoding="utf-8")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Nearest-place and radius queries over a KD-tree of places, scaled to the constructed world."""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Any, Iterable
+
+from validate_scale_model import in_geodetic_bounds, read_points
+
+DEFAULT_K = 5
+
+
+def unit_vector(lat: float, lon: float) -> tuple[float, float, float]:
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float, radius_km: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlam = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+    return 2 * radius_km * math.asin(min(1.0, math.sqrt(a)))
+
+
+class PlaceIndex:
+    """Balanced KD-tree over unit-sphere vectors, stored implicitly in arrays.
+
+    The node for ``order[lo:hi]`` sits at ``mid = (lo + hi) // 2`` and splits on ``axes[mid]``.
+    Straight-line (chord) distance between unit vectors grows with arc length, so the tree
+    prunes on squared chords and only the reported distances go through haversine.
+    """
+
+    def __init__(self, places: list[dict[str, Any]], radius_km: float) -> None:
+        self.places = places
+        self.radius_km = radius_km
+        self.vectors = [unit_vector(place["lat"], place["lon"]) for place in places]
+        self.order = list(range(len(places)))
+        self.axes = [0] * len(places)
+        self._build(0, len(places))
+
+    def _build(self, lo: int, hi: int) -> None:
+        if hi - lo <= 1:
+            return
+        vectors, span = self.vectors, self.order[lo:hi]
+        # Split on the axis with the widest spread so clustered gazetteers still get balanced boxes.
+        axis = max(range(3), key=lambda a: max(vectors[i][a] for i in span) - min(vectors[i][a] for i in span))
+        span.sort(key=lambda i: vectors[i][axis])
+        self.order[lo:hi] = span
+        mid = (lo + hi) // 2
+        self.axes[mid] = axis
+        self._build(lo, mid)
+        self._build(mid + 1, hi)
+
+    def _distance_km(self, index: int, lat: float, lon: float) -> float:
+        place = self.places[index]
+        return haversine_km(lat, lon, place["lat"], place["lon"], self.radius_km)
+
+    def _hit(self, index: int, distance_km: float) -> dict[str, Any]:
+        return dict(self.places[index], distance_km=round(distance_km, 3))
+
+    def nearest(self, lat: float, lon: float, k: int = DEFAULT_K) -> list[dict[str, Any]]:
+        """The ``k`` closest places, nearest first; ties go to the lower input position."""
+        query = unit_vector(lat, lon)
+        vectors, order, axes = self.vectors, self.order, self.axes
+        best: list[tuple[float, int]] = []  # max-heap of (-squared chord, -index)
+
+        def visit(lo: int, hi: int) -> None:
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            index = order[mid]
+            vector = vectors[index]
+            d2 = (vector[0] - query[0]) ** 2 + (vector[1] - query[1]) ** 2 + (vector[2] - query[2]) ** 2
+            if len(best) < k:
+                heapq.heappush(best, (-d2, -index))
+            elif (-d2, -index) > best[0]:
+                heapq.heapreplace(best, (-d2, -index))
+            if hi - lo == 1:
+                return
+            gap = query[axes[mid]] - vector[axes[mid]]
+            near, far = ((mid + 1, hi), (lo, mid)) if gap > 0 else ((lo, mid), (mid + 1, hi))
+            visit(*near)
+            if len(best) < k or gap * gap <= -best[0][0]:
+                visit(*far)
+
+        if k > 0:
+            visit(0, len(order))
+        ranked = [-neg_index for _, neg_index in sorted(best, reverse=True)]
+        return [self._hit(index, self._distance_km(index, lat, lon)) for index in ranked]
+
+    def within(self, lat: float, lon: float, distance_km: float) -> list[dict[str, Any]]:
+        """Places no farther than ``distance_km`` along the surface of the world, nearest first."""
+        query = unit_vector(lat, lon)
+        angle = min(math.pi, max(0.0, distance_km) / self.radius_km)
+        limit = (2 * math.sin(angle / 2)) ** 2 * (1 + 1e-12)
+        vectors, order, axes = self.vectors, self.order, self.axes
+        found: list[tuple[float, int]] = []
+        stack = [(0, len(order))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            index = order[mid]
+            vector = vectors[index]
+            d2 = (vector[0] - query[0]) ** 2 + (vector[1] - query[1]) ** 2 + (vector[2] - query[2]) ** 2
+            if d2 <= limit:
+                found.append((d2, index))
+            gap = query[axes[mid]] - vector[axes[mid]]
+            if gap <= 0 or gap * gap <= limit:
+                stack.append((lo, mid))
+            if gap >= 0 or gap * gap <= limit:
+                stack.append((mid + 1, hi))
+        # The chord bound is padded for rounding; the unrounded haversine distance decides, and
+        # only the reported value is rounded.
+        hits = []
+        for _, index in sorted(found):
+            surface_km = self._distance_km(index, lat, lon)
+            if surface_km <= distance_km:
+                hits.append(self._hit(index, surface_km))
+        return hits
+
+
+def load_places(points: Iterable[Any]) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """Placeable ``{id, name, lat, lon}`` records and counts of the ones skipped."""
+    places = []
+    skipped = {"invalid": 0, "out_of_bounds": 0}
+    for point in points:
+        lat = point.get("lat") if isinstance(point, dict) else None
+        lon = point.get("lon") if isinstance(point, dict) else None
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)) or lat != lat or lon != lon:
+            skipped["invalid"] += 1
+        elif not in_geodetic_bounds(lat, lon):
+            skipped["out_of_bounds"] += 1
+        else:
+            places.append({"id": point.get("id"), "name": point.get("name"), "lat": float(lat), "lon": float(lon)})
+    return places, skipped
+
+
+def run_queries(
+    index: PlaceIndex, queries: Iterable[Any], k: int, distance_km: float | None
+) -> tuple[list[dict[str, Any]], list[int]]:
+    """Answer each query point with its k nearest places, or with every place within ``distance_km``.
+
+    Also returns the positions of queries skipped for lacking numeric in-bounds lat/lon.
+    """
+    results, skipped = [], []
+    for position, query in enumerate(queries):
+        lat = query.get("lat") if isinstance(query, dict) else None
+        lon = query.get("lon") if isinstance(query, dict) else None
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)) or not in_geodetic_bounds(lat, lon):
+            skipped.append(position)
+            continue
+        hits = index.within(lat, lon, distance_km) if distance_km is not None else index.nearest(lat, lon, k)
+        results.append({"query": {"id": query.get("id"), "lat": lat, "lon": lon}, "places": hits})
+    return results, skipped
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--config", required=True, help="World config JSON supplying radius_km")
+    parser.add_argument(
+        "--points",
+        default="public/data/location_coordinates.json",
+        help="Places to index: GeoJSON, NDJSON or location_coordinates.json (see validate_scale_model.py)",
+    )
+    parser.add_argument(
+        "--points-format",
+        choices=("auto", "json", "ndjson"),
+        default="auto",
+        help="Format of --points and --queries",
+    )
+    parser.add_argument("--lat", type=float, help="Latitude of a single query")
+    parser.add_argument("--lon", type=float, help="Longitude of a single query")
+    parser.add_argument("--queries", help="Batch of query points in any --points format")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Nearest places returned per query")
+    parser.add_argument("--radius-km", type=float, help="Return every place within this distance instead of --k")
+    parser.add_argument("--output", help="Optional output file path")
+    args = parser.parse_args()
+
+    if args.queries:
+        queries: Iterable[Any] = read_points(Path(args.queries), args.points_format)
+    elif args.lat is not None and args.lon is not None:
+        queries = [{"id": None, "lat": args.lat, "lon": args.lon}]
+    else:
+        parser.error("pass --lat and --lon, or --queries")
+    if args.k < 0 or (args.radius_km is not None and args.radius_km < 0):
+        parser.error("--k and --radius-km must not be negative")
+
+    errors: list[str] = []
+    results: list[dict[str, Any]] = []
+    summary: dict[str, Any] = {}
+    world = json.loads(Path(args.config).read_text(encoding="utf-8")).get("world")
+    radius = world.get("radius_km") if isinstance(world, dict) else None
+    if not isinstance(radius, (int, float)) or radius <= 0:
+        errors.append("world.radius_km must be a positive number")
+    else:
+        try:
+            places, skipped = load_places(read_points(Path(args.points), args.points_format))
+            index = PlaceIndex(places, float(radius))
+            results, skipped_queries = run_queries(index, queries, args.k, args.radius_km)
+        except (OSError, ValueError) as exc:
+            errors.append(str(exc))
+        else:
+            summary = {
+                "radius_km": float(radius),
+                "place_count": len(places),
+                "skipped": skipped,
+                "query_count": len(results) + len(skipped_queries),
+                "skipped_queries": skipped_queries,
+            }
+
+    result = {
+        "error_count": len(errors),
+        "errors": errors,
+        "summary": summary,
+        "mode": "within" if args.radius_km is not None else "nearest",
+        "results": results,
+    }
+    payload = json.dumps(result, indent=2)
+    print(payload)
+    if args.output:
+        Path(args.output).write_text(payload, encoding="utf-8")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,16 +5,249 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
 import sys
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the numpy engine needs it
+    np = None
+
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
+
+DEFAULT_MAX_OFFENDERS = 20
+NUMPY_BATCH = 1 << 16
+NDJSON_SUFFIXES = {".ndjson", ".jsonl", ".geojsonl", ".geojsons"}
+# Arrays holding points in the supported documents: GeoJSON, location_coordinates.json, world config.
+POINT_ARRAYS = ("features", "items", "points")
+
+
+def in_geodetic_bounds(lat: float, lon: float) -> bool:
+    return -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def empty_stats() -> dict[str, Any]:
+    return {
+        "count": 0,
+        "in_bounds": 0,
+        "invalid": 0,
+        "out_of_bounds": 0,
+        "bbox": None,
+        "first_invalid": [],
+        "first_out_of_bounds": [],
+    }
+
+
+def finish_stats(stats: dict[str, Any]) -> dict[str, Any]:
+    bbox = stats["bbox"]
+    stats["bbox"] = bbox and dict(zip(("min_lat", "max_lat", "min_lon", "max_lon"), map(float, bbox)))
+    return stats
+
+
+def scan_points_python(points: Iterable[Any], max_offenders: int) -> dict[str, Any]:
+    """Reference engine: one pass over the point dicts, aggregating instead of reporting per point."""
+    stats = empty_stats()
+    bbox: list[float] | None = None
+    idx = -1
+    for idx, point in enumerate(points):
+        lat = point.get("lat") if isinstance(point, dict) else None
+        lon = point.get("lon") if isinstance(point, dict) else None
+        # NaN is numeric to isinstance but can never be placed, so it counts as invalid.
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)) or lat != lat or lon != lon:
+            stats["invalid"] += 1
+            if len(stats["first_invalid"]) < max_offenders:
+                stats["first_invalid"].append(idx)
+        elif not in_geodetic_bounds(lat, lon):
+            stats["out_of_bounds"] += 1
+            if len(stats["first_out_of_bounds"]) < max_offenders:
+                stats["first_out_of_bounds"].append(idx)
+        elif bbox is None:
+            bbox = [float(lat), float(lat), float(lon), float(lon)]
+        else:
+            bbox = [min(bbox[0], lat), max(bbox[1], lat), min(bbox[2], lon), max(bbox[3], lon)]
+    stats["count"] = idx + 1
+    stats["in_bounds"] = stats["count"] - stats["invalid"] - stats["out_of_bounds"]
+    stats["bbox"] = bbox
+    return finish_stats(stats)
+
+
+def to_float(value: Any) -> float:
+    """Coordinate as a float: NaN when not numeric, signed infinity for an int too large for a float."""
+    if not isinstance(value, (int, float)):
+        return math.nan
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+def scan_points_numpy(points: Iterable[Any], max_offenders: int) -> dict[str, Any]:
+    """Vectorized engine with output identical to ``scan_points_python``.
+
+    Points are taken in batches of ``NUMPY_BATCH`` so streamed input stays bounded in memory.
+    Only the coordinate extraction touches each dict; type, bounds and bbox checks are array masks.
+    """
+
+    def coordinates(batch: list[Any], key: str) -> Any:
+        values = [point.get(key) if isinstance(point, dict) else None for point in batch]
+        try:
+            return np.fromiter(
+                (value if isinstance(value, (int, float)) else math.nan for value in values), np.float64, len(values)
+            )
+        except OverflowError:
+            # An int beyond float64 range is numeric but out of bounds in the Python engine; inf keeps it so.
+            return np.fromiter((to_float(value) for value in values), np.float64, len(values))
+
+    def first(mask: Any, found: list[int], offset: int) -> None:
+        found.extend((np.flatnonzero(mask)[: max_offenders - len(found)] + offset).tolist())
+
+    stats = empty_stats()
+    iterator = iter(points)
+    while batch := list(islice(iterator, NUMPY_BATCH)):
+        lats, lons = coordinates(batch, "lat"), coordinates(batch, "lon")
+        invalid = np.isnan(lats) | np.isnan(lons)
+        with np.errstate(invalid="ignore"):
+            out_of_bounds = ~invalid & ((lats < -90) | (lats > 90) | (lons < -180) | (lons > 180))
+        placed = ~(invalid | out_of_bounds)
+        first(invalid, stats["first_invalid"], stats["count"])
+        first(out_of_bounds, stats["first_out_of_bounds"], stats["count"])
+        stats["count"] += len(batch)
+        stats["in_bounds"] += int(placed.sum())
+        stats["invalid"] += int(invalid.sum())
+        stats["out_of_bounds"] += int(out_of_bounds.sum())
+        if placed.any():
+            lat_in, lon_in = lats[placed], lons[placed]
+            found = [float(lat_in.min()), float(lat_in.max()), float(lon_in.min()), float(lon_in.max())]
+            bbox = stats["bbox"] or found
+            stats["bbox"] = [
+                min(bbox[0], found[0]),
+                max(bbox[1], found[1]),
+                min(bbox[2], found[2]),
+                max(bbox[3], found[3]),
+            ]
+    return finish_stats(stats)
+
+
+ENGINES: dict[str, Callable[[Iterable[Any], int], dict[str, Any]]] = {
+    "python": scan_points_python,
+    "numpy": scan_points_numpy,
+}
+
+
+def normalize_point(record: Any) -> Any:
+    """Map a GeoJSON Point feature or a location_coordinates item onto ``{id, name, lat, lon}``.
+
+    Anything else passes through unchanged, so malformed records are still counted as invalid.
+    """
+    if not isinstance(record, dict):
+        return record
+    if record.get("type") == "Feature":
+        geometry = record.get("geometry")
+        coordinates = geometry.get("coordinates") if isinstance(geometry, dict) else None
+        if not isinstance(coordinates, list):
+            coordinates = None
+        properties = record.get("properties") if isinstance(record.get("properties"), dict) else {}
+        point = {"id": record.get("id", properties.get("id")), "name": properties.get("name")}
+        if isinstance(geometry, dict) and geometry.get("type") == "Point" and len(coordinates or []) >= 2:
+            point["lon"], point["lat"] = coordinates[0], coordinates[1]
+        return point
+    if "qid" in record and "id" not in record:
+        return {"id": record["qid"], "name": record.get("name"), "lat": record.get("lat"), "lon": record.get("lon")}
+    return record
+
+
+def read_ndjson_points(path: Path) -> Iterator[Any]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"line {line_no}: {exc.msg}") from None
+
+
+def read_json_points(path: Path) -> Iterator[Any]:
+    """Stream a top-level point array, or the first of ``POINT_ARRAYS`` in a top-level object."""
+    # The streaming reader is shared with the artifact auditor; it is loaded only for --points.
+    json_stream = skill_module("artifact-contract-auditor", "json_stream")
+    with path.open("r", encoding="utf-8") as handle:
+        stream = json_stream.JsonStream(handle)
+        if stream.peek() == "[":
+            yield from stream.iter_array()
+            return
+        found = False
+        stream.expect("{", "Expecting an array or object")
+        while stream.peek() != "}":
+            if stream.peek() != '"':
+                raise stream.error("Expecting property name enclosed in double quotes")
+            key = stream.value()
+            stream.expect(":", "Expecting ':' delimiter")
+            if key in POINT_ARRAYS and not found and stream.peek() == "[":
+                found = True
+                yield from stream.iter_elements()
+            else:
+                stream.value()
+            if stream.peek() != ",":
+                break
+            stream.pos += 1
+        stream.expect("}", "Expecting ',' delimiter")
+        if stream.peek():
+            raise stream.error("Extra data")
+        if not found:
+            raise ValueError(f"no {'/'.join(POINT_ARRAYS)} array found")
+
+
+def read_points(path: Path, points_format: str) -> Iterator[Any]:
+    if points_format == "auto":
+        points_format = "ndjson" if path.suffix.lower() in NDJSON_SUFFIXES else "json"
+    records = read_ndjson_points(path) if points_format == "ndjson" else read_json_points(path)
+    return map(normalize_point, records)
+
+
+def bbox_extent_km(bbox: dict[str, float], radius_km: float) -> dict[str, float]:
+    """North-south and widest east-west span of ``bbox`` on a sphere of ``radius_km``."""
+    widest_lat = 0.0 if bbox["min_lat"] <= 0 <= bbox["max_lat"] else min(abs(bbox["min_lat"]), abs(bbox["max_lat"]))
+    north_south = math.radians(bbox["max_lat"] - bbox["min_lat"]) * radius_km
+    east_west = math.radians(bbox["max_lon"] - bbox["min_lon"]) * radius_km * math.cos(math.radians(widest_lat))
+    return {"north_south": round(north_south, 3), "east_west": round(east_west, 3)}
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--config", required=True, help="Path to world config JSON")
     parser.add_argument("--report", help="Optional report output path")
+    parser.add_argument(
+        "--points",
+        help="Stream points from a GeoJSON FeatureCollection, NDJSON file or location_coordinates.json instead",
+    )
+    parser.add_argument(
+        "--points-format",
+        choices=("auto", "json", "ndjson"),
+        default="auto",
+        help="Format of --points; auto picks ndjson for .ndjson/.jsonl/.geojsonl/.geojsons files",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("auto", "python", "numpy"),
+        default="auto",
+        help="Point validation engine; auto uses numpy when it is installed (output is identical)",
+    )
+    parser.add_argument(
+        "--max-offenders",
+        type=int,
+        default=DEFAULT_MAX_OFFENDERS,
+        help="How many invalid and out-of-bounds point indices to list",
+    )
     args = parser.parse_args()
+    if args.engine == "numpy" and np is None:
+        parser.error("--engine numpy requires numpy to be installed")
+    engine = args.engine if args.engine != "auto" else ("numpy" if np is not None else "python")
 
     config = json.loads(Path(args.config).read_text(encoding="utf-8"))
     errors: list[str] = []
@@ -39,29 +272,43 @@ def main() -> int:
             warnings.append(f"Extreme scale modifier: {scale_modifier:.4f}")
 
     projection = str(config.get("projection", "geodetic")).lower()
-    points = config.get("points", [])
+    points: Iterable[Any] = config.get("points", [])
     bounds_ok = True
-    if not isinstance(points, list):
+    if args.points:
+        points = read_points(Path(args.points), args.points_format)
+    elif not isinstance(points, list):
         errors.append("points must be an array")
         points = []
 
+    point_stats = None
     if projection == "geodetic":
-        for idx, point in enumerate(points):
-            if not isinstance(point, dict):
-                errors.append(f"points[{idx}] must be an object")
-                continue
-            lat = point.get("lat")
-            lon = point.get("lon")
-            if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
-                errors.append(f"points[{idx}] lat/lon must be numeric")
-                continue
-            if lat < -90 or lat > 90 or lon < -180 or lon > 180:
-                bounds_ok = False
-                warnings.append(f"points[{idx}] is out of geodetic bounds")
+        try:
+            point_stats = ENGINES[engine](points, args.max_offenders)
+        except (OSError, ValueError) as exc:
+            errors.append(f"points file {args.points} could not be read: {exc}")
     else:
         warnings.append("projection is non-geodetic; manual compatibility review required")
         bounds_ok = False
 
+    if point_stats:
+        if point_stats["invalid"]:
+            errors.append(
+                f"{point_stats['invalid']} of {point_stats['count']} points are not objects with numeric lat/lon"
+                f" (first indices: {point_stats['first_invalid']})"
+            )
+        if point_stats["out_of_bounds"]:
+            bounds_ok = False
+            warnings.append(
+                f"{point_stats['out_of_bounds']} of {point_stats['count']} points are out of geodetic bounds"
+                f" (first indices: {point_stats['first_out_of_bounds']})"
+            )
+        # The extent is measured on the constructed world, i.e. already scaled by the modifier.
+        point_stats["extent_km"] = (
+            bbox_extent_km(point_stats["bbox"], float(radius))
+            if point_stats["bbox"] and scale_modifier is not None
+            else None
+        )
+
     postgis_compatible = projection == "geodetic" and bounds_ok and not errors
     result = {
         "error_count": len(errors),
@@ -69,6 +316,8 @@ def main() -> int:
         "scale_modifier": scale_modifier,
         "projection": projection,
         "postgis_compatible": postgis_compatible,
+        "engine": engine,
+        "points": point_stats,
         "errors": errors,
         "warnings": warnings,
     }
@@ -4,11 +4,25 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from doc_scan import DocumentScan
+
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
+
+# The shared document scanner lives with the spec/ADR sync checker.
+DOC_SCAN = SKILLS / "spec-adr-sync-checker" / "scripts" / "doc_scan.py"
 
 DOCS_REQUIRED = [
     "docs/OVERHAUL_PLAN.md",
@@ -20,70 +34,344 @@ DOCS_REQUIRED = [
     "docs/ADR/ADR-0004-map-navigation-engine.md",
 ]
 
+ACCEPTED_PHRASE = "status: accepted"
+RESET_PHRASE = "full reset, including `layer` reset"
+HARD_FILTER_PHRASE = "layer filtering is hard-filter semantics"
+PHRASES = {
+    **{rel: [] for rel in DOCS_REQUIRED},
+    **{rel: [ACCEPTED_PHRASE] for rel in DOCS_REQUIRED[-4:]},
+    "docs/UX_NAV_SPEC.md": [RESET_PHRASE],
+    "docs/DATA_QUERY_SPEC.md": [HARD_FILTER_PHRASE],
+}
 
-def read_lower(path: Path) -> str:
-    return path.read_text(encoding="utf-8").lower()
+# Document checkers answered in-process from the gate's own scan (names as in doc_scan.CHECKERS).
+DOCUMENT_CHECKS = ["spec-adr-sync", "url-policy", "filter-sync"]
+# Skill checks run as concurrent subprocesses from --root; paths are relative to the skills directory.
+COMMAND_CHECKS = {
+    "artifact-contract": [
+        "artifact-contract-auditor/scripts/audit_artifacts.py",
+        "--data-dir",
+        "public/data",
+        "--profile",
+        "m2c",
+    ],
+    "theme-usage": ["mui-theme-system-governor/scripts/audit_theme_usage.py", "--root", "."],
+    "a11y-markers": ["mui-accessibility-hardening/scripts/check_a11y_markers.py", "--root", "."],
+    "grid-contract": ["mui-x-grid-query-integration/scripts/check_grid_contract.py", "--root", "."],
+}
+BUILD_COMMAND = ["npm", "run", "build"]
+OUTPUT_TAIL_CHARS = 4000
 
+# Root-relative globs each check reads, besides its own skill's scripts and references.
+CHECK_INPUTS = {
+    "artifact-contract": ["public/data/**/*"],
+    "theme-usage": ["src/**/*.ts", "src/**/*.tsx"],
+    "a11y-markers": ["src/**/*.tsx"],
+    "grid-contract": ["src/**/*.ts", "src/**/*.tsx"],
+    "build": [
+        "src/**/*",
+        "public/**/*",
+        "index.html",
+        "package.json",
+        "package-lock.json",
+        "tsconfig.json",
+        "vite.config.ts",
+    ],
+}
+# Scanners the checks import from other skills; editing one reruns every check.
+SHARED_SCANNERS = [DOC_SCAN, SKILLS / "mui-theme-system-governor" / "scripts" / "src_scan.py"]
+CACHE_VERSION = 1
+CHANGED_EXAMPLES = 5
 
-def run_build(root: Path) -> tuple[bool, str]:
-    cmd = ["npm", "run", "build"]
-    proc = subprocess.run(cmd, cwd=root, capture_output=True, text=True, check=False)
-    output = (proc.stdout or "") + (proc.stderr or "")
-    return (proc.returncode == 0, output[-4000:])
 
-
-def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--root", default=".", help="Repository root")
-    parser.add_argument("--run-build", action="store_true", help="Run npm build as part of gate")
-    parser.add_argument("--report", help="Optional report path")
-    args = parser.parse_args()
-
-    root = Path(args.root)
+def evaluate(root: Path, scan: DocumentScan) -> tuple[dict[str, Any], int]:
     failures: list[str] = []
-    warnings: list[str] = []
 
     for rel in DOCS_REQUIRED:
-        path = root / rel
-        if not path.exists():
+        if not scan.exists(rel):
             failures.append(f"Missing required doc: {rel}")
 
     for rel in DOCS_REQUIRED[-4:]:
-        path = root / rel
-        if path.exists() and "status: accepted" not in read_lower(path):
+        if scan.exists(rel) and not scan.contains(rel, ACCEPTED_PHRASE):
             failures.append(f"ADR not accepted: {rel}")
 
-    ux_path = root / "docs/UX_NAV_SPEC.md"
-    data_path = root / "docs/DATA_QUERY_SPEC.md"
-    if ux_path.exists() and "full reset, including `layer` reset" not in read_lower(ux_path):
+    ux_rel = "docs/UX_NAV_SPEC.md"
+    data_rel = "docs/DATA_QUERY_SPEC.md"
+    if scan.exists(ux_rel) and not scan.contains(ux_rel, RESET_PHRASE):
         failures.append("UX spec missing full reset policy")
-    if data_path.exists() and "layer filtering is hard-filter semantics" not in read_lower(data_path):
+    if scan.exists(data_rel) and not scan.contains(data_rel, HARD_FILTER_PHRASE):
         failures.append("Data spec missing hard-filter policy")
 
-    build_ok = None
-    build_tail = ""
-    if args.run_build:
-        build_ok, build_tail = run_build(root)
-        if not build_ok:
-            failures.append("npm run build failed")
+    report = {"failure_count": len(failures), "failures": failures}
+    return report, 1 if failures else 0
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class GateCache:
+    """Stored check verdicts keyed by the content hashes of each check's inputs.
+
+    File size and mtime are a fast precheck: while both match the recorded values the
+    stored hash is reused without reading the file. Verdicts are also salted with hashes
+    of this script and the document scanner, so changing the gate itself reruns everything.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.salt = file_digest(Path(__file__)) + file_digest(DOC_SCAN)
+        self.files: dict[str, dict[str, Any]] = {}
+        self.checks: dict[str, Any] = {}
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raw = None
+        if isinstance(raw, dict) and raw.get("version") == CACHE_VERSION and raw.get("salt") == self.salt:
+            if isinstance(raw.get("files"), dict):
+                self.files = raw["files"]
+            if isinstance(raw.get("checks"), dict):
+                self.checks = raw["checks"]
+
+    def fingerprint(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path.resolve())
+        entry = self.files.get(key)
+        if isinstance(entry, dict) and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry["sha256"]
+        digest = file_digest(path)
+        self.files[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def inputs(self, root: Path, patterns: list[str], extra: list[Path]) -> dict[str, str]:
+        """Content hash of every file matched by the root-relative ``patterns`` and of ``extra``."""
+        paths = {path for pattern in patterns for path in root.glob(pattern) if path.is_file()}
+        paths.update(path for path in extra if path.is_file())
+        hashes = {}
+        for path in paths:
+            try:
+                label = path.resolve().relative_to(root.resolve()).as_posix()
+            except ValueError:
+                label = path.resolve().as_posix()
+            hashes[label] = self.fingerprint(path)
+        return dict(sorted(hashes.items()))
+
+    def lookup(self, name: str, command: str, inputs: dict[str, str]) -> tuple[dict[str, Any] | None, list[str]]:
+        """The stored verdict when command and inputs are unchanged, else the paths that changed."""
+        entry = self.checks.get(name)
+        if not isinstance(entry, dict):
+            return None, []
+        previous = entry.get("inputs", {})
+        changed = sorted(path for path in previous.keys() | inputs.keys() if previous.get(path) != inputs.get(path))
+        if entry.get("command") == command and not changed:
+            return entry["result"], []
+        return None, changed
+
+    def put(self, name: str, command: str, inputs: dict[str, str], result: dict[str, Any]) -> None:
+        self.checks[name] = {"command": command, "inputs": inputs, "result": result}
+
+    def save(self) -> None:
+        files = {key: value for key, value in self.files.items() if Path(key).exists()}
+        payload = {"version": CACHE_VERSION, "salt": self.salt, "files": files, "checks": self.checks}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+def run_command(root: Path, command: list[str], timeout: float | None) -> dict[str, Any]:
+    """Run one check to completion; the parsed JSON report is kept when stdout is one."""
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(command, cwd=root, capture_output=True, text=True, check=False, timeout=timeout)
+        exit_code, stdout, stderr = proc.returncode, proc.stdout or "", proc.stderr or ""
+    except subprocess.TimeoutExpired as exc:
+        exit_code, stdout, stderr = None, "", f"timed out after {timeout}s\n{exc.stderr or ''}"
+    except OSError as exc:
+        exit_code, stdout, stderr = None, "", str(exc)
+    result: dict[str, Any] = {
+        "command": " ".join(command),
+        "ok": exit_code == 0,
+        "exit_code": exit_code,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    try:
+        result["report"] = json.loads(stdout)
+    except json.JSONDecodeError:
+        result["output_tail"] = (stdout + stderr)[-OUTPUT_TAIL_CHARS:]
     else:
+        if stderr:
+            result["output_tail"] = stderr[-OUTPUT_TAIL_CHARS:]
+    return result
+
+
+def document_checkers(names: list[str]) -> dict[str, Any]:
+    doc_scan = skill_module("spec-adr-sync-checker", "doc_scan")
+    return {name: doc_scan.load_checker(name) for name in DOCUMENT_CHECKS if name in names}
+
+
+def run_documents(root: Path, checkers: dict[str, Any]) -> dict[str, Any]:
+    """Gate doc policy plus the given document checkers, all answered from one shared scan."""
+    start = time.perf_counter()
+    doc_scan = skill_module("spec-adr-sync-checker", "doc_scan")
+    scan = doc_scan.scan_documents(root, PHRASES, *(checker.PHRASES for checker in checkers.values()))
+    reports: dict[str, Any] = {}
+    failed = []
+    for name, evaluate_check in [("release-gate", evaluate), *((n, c.evaluate) for n, c in checkers.items())]:
+        reports[name], status = evaluate_check(root, scan)
+        if status:
+            failed.append(name)
+    return {
+        "command": "in-process document scan",
+        "ok": not failed,
+        "exit_code": 1 if failed else 0,
+        "seconds": round(time.perf_counter() - start, 3),
+        "failed_checks": failed,
+        "report": {"checks": reports, "documents_read": scan.reads},
+    }
+
+
+def plan_checks(names: list[str], run_build: bool) -> dict[str, tuple[list[str], list[str], list[Path]]]:
+    """``name -> (command, root-relative input globs, extra input files)`` for every subprocess check."""
+    plan = {}
+    for name, (script, *args) in COMMAND_CHECKS.items():
+        if name in names:
+            skill = SKILLS / script.split("/")[0]
+            extra = [*sorted((skill / "scripts").glob("*.py")), *sorted((skill / "references").glob("*"))]
+            extra += SHARED_SCANNERS
+            plan[name] = ([sys.executable, str(SKILLS / script), *args], CHECK_INPUTS[name], extra)
+    if run_build:
+        plan["build"] = (BUILD_COMMAND, CHECK_INPUTS["build"], [])
+    return plan
+
+
+def run_gate(
+    root: Path,
+    names: list[str],
+    run_build: bool,
+    jobs: int | None,
+    timeout: float | None,
+    cache: GateCache | None = None,
+    force: bool = False,
+) -> dict[str, Any]:
+    """Run the build and every selected command check concurrently while the documents are scanned.
+
+    Gate wall time is then close to the slowest single check rather than the sum of all of them.
+    With a ``cache``, checks whose command and input hashes match the stored run reuse its verdict.
+    """
+    start = time.perf_counter()
+    checkers = document_checkers(names)
+    plan = plan_checks(names, run_build)
+    doc_paths = sorted(set(PHRASES).union(*(checker.PHRASES for checker in checkers.values())))
+    doc_extra = [Path(checker.__file__) for checker in checkers.values()]
+    inputs: dict[str, dict[str, str]] = {}
+    commands = {"documents": f"in-process document scan: {','.join(['release-gate', *checkers])}"}
+    commands.update((name, " ".join(command)) for name, (command, _, _) in plan.items())
+    checks: dict[str, dict[str, Any]] = {}
+    changed: dict[str, list[str]] = {}
+    if cache is not None:
+        inputs["documents"] = cache.inputs(root, doc_paths, doc_extra)
+        inputs.update((name, cache.inputs(root, patterns, extra)) for name, (_, patterns, extra) in plan.items())
+        for name, command in commands.items():
+            stored, changed[name] = cache.lookup(name, command, inputs[name])
+            if stored is not None and not force:
+                checks[name] = dict(stored, cached=True)
+
+    pending = {name: command for name, (command, _, _) in plan.items() if name not in checks}
+    with ThreadPoolExecutor(max_workers=jobs or max(1, len(pending))) as pool:
+        futures = {name: pool.submit(run_command, root, command, timeout) for name, command in pending.items()}
+        if "documents" not in checks:
+            checks["documents"] = run_documents(root, checkers)
+        checks.update((name, future.result()) for name, future in futures.items())
+    wall = time.perf_counter() - start
+
+    for name, result in checks.items():
+        if result.get("cached"):
+            continue
+        result["cached"] = False
+        if changed.get(name):
+            result["changed_inputs"] = changed[name][:CHANGED_EXAMPLES]
+            result["changed_input_count"] = len(changed[name])
+        # A check that never finished says nothing about its inputs, so it is not stored.
+        if cache is not None and result["exit_code"] is not None:
+            stored = {key: value for key, value in result.items() if key not in ("cached", "changed_inputs")}
+            stored.pop("changed_input_count", None)
+            cache.put(name, commands[name], inputs[name], stored)
+    if cache is not None:
+        cache.save()
+
+    documents = checks["documents"]
+    failures: list[str] = list(documents["report"]["checks"]["release-gate"]["failures"])
+    warnings: list[str] = []
+    failures.extend(f"Check failed: {name}" for name in documents["failed_checks"] if name != "release-gate")
+    for name, result in checks.items():
+        if name == "build" and not result["ok"]:
+            failures.append("npm run build failed")
+        elif name not in ("build", "documents") and not result["ok"]:
+            failures.append(f"Check failed: {name} (exit {result['exit_code']})")
+    if not run_build:
         warnings.append("Build check skipped (use --run-build for release gate).")
 
-    report = {
+    build = checks.get("build")
+    ordered = {name: checks[name] for name in commands}
+    return {
         "failure_count": len(failures),
         "warning_count": len(warnings),
         "failures": failures,
         "warnings": warnings,
-        "build_ok": build_ok,
-        "build_output_tail": build_tail,
+        "build_ok": build["ok"] if build else None,
+        "build_output_tail": build.get("output_tail", "") if build else "",
+        "wall_seconds": round(wall, 3),
+        "serial_seconds": round(sum(r["seconds"] for r in checks.values() if not r["cached"]), 3),
+        "reused_seconds": round(sum(r["seconds"] for r in checks.values() if r["cached"]), 3),
+        "cached_checks": [name for name in ordered if ordered[name]["cached"]],
+        "checks": ordered,
     }
 
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default=".", help="Repository root")
+    parser.add_argument("--run-build", action="store_true", help="Run npm build as part of gate")
+    parser.add_argument(
+        "--checks",
+        default="all",
+        help=(
+            "Comma-separated skill checks to run alongside the gate's doc policy: "
+            f"{', '.join(DOCUMENT_CHECKS + list(COMMAND_CHECKS))}, all, or none"
+        ),
+    )
+    parser.add_argument("--jobs", type=int, help="Concurrent check processes (default: one per check)")
+    parser.add_argument("--timeout", type=float, help="Seconds before a single check is stopped and failed")
+    parser.add_argument(
+        "--cache",
+        help="Optional path to a verdict cache; checks whose inputs are unchanged since the stored run are skipped",
+    )
+    parser.add_argument("--force", action="store_true", help="Rerun every check even when --cache has its verdict")
+    parser.add_argument("--report", help="Optional report path")
+    args = parser.parse_args()
+
+    known = DOCUMENT_CHECKS + list(COMMAND_CHECKS)
+    names = {"all": known, "none": []}.get(args.checks, args.checks.split(","))
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        parser.error(f"unknown check(s): {', '.join(unknown)}")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    cache = GateCache(Path(args.cache)) if args.cache else None
+    report = run_gate(Path(args.root), names, args.run_build, args.jobs, args.timeout, cache, args.force)
+
     payload = json.dumps(report, indent=2)
     print(payload)
     if args.report:
         Path(args.report).write_text(payload, encoding="utf-8")
 
-    return 1 if failures else 0
+    return 1 if report["failures"] else 0
 
 
 if __name__ == "__main__":
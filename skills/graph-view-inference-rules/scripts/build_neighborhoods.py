@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""Build per-layer CSR adjacency and precomputed hub neighborhoods as a memory-mappable index."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Any
+
+from infer_clusters import extract_layer, normalize_entity_id
+
+MAGIC = b"PSGRAPHX"
+VERSION = 1
+
+# Section order in the header table; each entry is (u64 offset, u64 length).
+SECTIONS = (
+    "meta",
+    "string_offsets",
+    "string_data",
+    "nodes",
+    "offsets",
+    "targets",
+    "edge_assertions",
+    "hubs",
+    "hood_nodes",
+    "hood_hops",
+)
+HEADER = struct.Struct("<8sII")
+SECTION = struct.Struct("<QQ")
+HEADER_SIZE = HEADER.size + SECTION.size * len(SECTIONS)
+
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+HUB_ENTRY = struct.Struct("<IQII")  # local node, first hood entry, hood size, flags
+HUB_TRUNCATED = 1
+
+# Matches the backend default graph depth; hubs are the entities whose on-demand expansion hurts.
+DEFAULT_MAX_HOPS = 2
+DEFAULT_MAX_NODES = 1000
+DEFAULT_HUB_DEGREE = 16
+
+
+class NeighborhoodError(ValueError):
+    """Raised when a neighborhood index is malformed or cannot be built."""
+
+
+def utf8_order(values: list[str]) -> list[str]:
+    return sorted(values, key=lambda value: value.encode("utf-8"))
+
+
+def layer_edges(
+    by_id: dict[str, Any], by_layer: dict[str, list[str]] | None
+) -> dict[str, list[tuple[str, str, str]]]:
+    """``(subject, object, assertion_id)`` edges per layer, from the layer index or each record's layer."""
+    edges: dict[str, list[tuple[str, str, str]]] = {}
+    if by_layer is None:
+        by_layer = {}
+        for assertion_id, record in by_id.items():
+            if isinstance(record, dict):
+                by_layer.setdefault(extract_layer(record), []).append(assertion_id)
+    for layer, assertion_ids in by_layer.items():
+        rows = edges.setdefault(layer, [])
+        for assertion_id in assertion_ids:
+            record = by_id.get(assertion_id)
+            if not isinstance(record, dict):
+                continue
+            subject = normalize_entity_id(record, "subject")
+            obj = normalize_entity_id(record, "object")
+            if subject and obj:
+                rows.append((subject, obj, assertion_id))
+    return edges
+
+
+def build_csr(
+    edges: list[tuple[str, str, str]], intern: dict[str, int]
+) -> tuple[list[str], list[int], list[int], list[int]]:
+    """Undirected CSR over the layer's entities, sorted by UTF-8 id.
+
+    Returns ``(nodes, offsets, targets, assertions)``; each node's entries are ordered by
+    neighbor, then assertion id, so traversal order is deterministic.
+    """
+    nodes = utf8_order(list({entity for subject, obj, _ in edges for entity in (subject, obj)}))
+    local = {entity: i for i, entity in enumerate(nodes)}
+    adjacency: list[list[tuple[int, bytes, str]]] = [[] for _ in nodes]
+    for subject, obj, assertion_id in edges:
+        key = assertion_id.encode("utf-8")
+        adjacency[local[subject]].append((local[obj], key, assertion_id))
+        if obj != subject:
+            adjacency[local[obj]].append((local[subject], key, assertion_id))
+    offsets = [0]
+    targets: list[int] = []
+    assertions: list[int] = []
+    for entries in adjacency:
+        entries.sort()
+        for target, _, assertion_id in entries:
+            targets.append(target)
+            assertions.append(intern.setdefault(assertion_id, len(intern)))
+        offsets.append(len(targets))
+    return nodes, offsets, targets, assertions
+
+
+def bounded_bfs(
+    start: int, offsets: list[int], targets: list[int], max_hops: int, max_nodes: int
+) -> tuple[list[tuple[int, int]], bool]:
+    """Nodes within ``max_hops`` of ``start`` as ``(node, hop)`` in BFS order.
+
+    ``max_nodes`` caps the whole result, ``start`` included, not the fan-out of any one node;
+    the flag is set when the BFS stopped there with nodes left unvisited.
+    """
+    seen = {start}
+    order = [(start, 0)]
+    frontier = [start]
+    for hop in range(1, max_hops + 1):
+        next_frontier = []
+        for node in frontier:
+            for target in targets[offsets[node] : offsets[node + 1]]:
+                if target in seen:
+                    continue
+                if len(order) >= max_nodes:
+                    return order, True
+                seen.add(target)
+                order.append((target, hop))
+                next_frontier.append(target)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return order, False
+
+
+def build_index(
+    data_dir: Path, max_hops: int, max_nodes: int, hub_degree: int
+) -> tuple[bytes, dict[str, Any]]:
+    """Build the index for ``data_dir`` and return its bytes plus a summary for the report."""
+    by_id_path = data_dir / "assertions_by_id.json"
+    if not by_id_path.exists():
+        raise NeighborhoodError(f"Missing file: {by_id_path}")
+    by_id = json.loads(by_id_path.read_text(encoding="utf-8"))
+    layer_path = data_dir / "assertions_by_layer.json"
+    by_layer = json.loads(layer_path.read_text(encoding="utf-8")) if layer_path.exists() else None
+    if not isinstance(by_id, dict) or (by_layer is not None and not isinstance(by_layer, dict)):
+        raise NeighborhoodError("assertions_by_id.json and assertions_by_layer.json must be objects")
+
+    intern: dict[str, int] = {}
+    layers_meta = []
+    nodes: list[int] = []
+    offsets: list[int] = [0]
+    targets: list[int] = []
+    edge_assertions: list[int] = []
+    hubs = bytearray()
+    hood_nodes: list[int] = []
+    hood_hops = bytearray()
+    truncated_hubs = 0
+    hub_count = 0
+    for layer, edges in layer_edges(by_id, by_layer).items():
+        intern.setdefault(layer, len(intern))
+        layer_nodes, layer_offsets, layer_targets, layer_assertions = build_csr(edges, intern)
+        entry = {
+            "id": layer,
+            "node_base": len(nodes),
+            "node_count": len(layer_nodes),
+            "edge_base": len(targets),
+            "edge_count": len(layer_targets),
+            "hub_base": hub_count,
+        }
+        nodes.extend(intern.setdefault(entity, len(intern)) for entity in layer_nodes)
+        offsets.extend(entry["edge_base"] + offset for offset in layer_offsets[1:])
+        targets.extend(layer_targets)
+        edge_assertions.extend(layer_assertions)
+        for node in range(len(layer_nodes)):
+            if layer_offsets[node + 1] - layer_offsets[node] < hub_degree:
+                continue
+            order, truncated = bounded_bfs(node, layer_offsets, layer_targets, max_hops, max_nodes)
+            hubs += HUB_ENTRY.pack(node, len(hood_nodes), len(order), HUB_TRUNCATED if truncated else 0)
+            hood_nodes.extend(member for member, _ in order)
+            hood_hops += bytes(hop for _, hop in order)
+            truncated_hubs += truncated
+            hub_count += 1
+        entry["hub_count"] = hub_count - entry["hub_base"]
+        layers_meta.append(entry)
+
+    string_data = bytearray()
+    string_offsets = [0]
+    for text in intern:
+        string_data += text.encode("utf-8")
+        string_offsets.append(len(string_data))
+    meta = {
+        "max_hops": max_hops,
+        "max_nodes": max_nodes,
+        "hub_degree": hub_degree,
+        "node_count": len(nodes),
+        "edge_count": len(targets),
+        "hub_count": hub_count,
+        "layers": layers_meta,
+    }
+    payloads = {
+        "meta": json.dumps(meta, sort_keys=True).encode("utf-8"),
+        "string_offsets": struct.pack(f"<{len(string_offsets)}Q", *string_offsets),
+        "string_data": bytes(string_data),
+        "nodes": struct.pack(f"<{len(nodes)}I", *nodes),
+        "offsets": struct.pack(f"<{len(offsets)}Q", *offsets),
+        "targets": struct.pack(f"<{len(targets)}I", *targets),
+        "edge_assertions": struct.pack(f"<{len(edge_assertions)}I", *edge_assertions),
+        "hubs": bytes(hubs),
+        "hood_nodes": struct.pack(f"<{len(hood_nodes)}I", *hood_nodes),
+        "hood_hops": bytes(hood_hops),
+    }
+    table = bytearray(HEADER.pack(MAGIC, VERSION, len(SECTIONS)))
+    body = bytearray()
+    for name in SECTIONS:
+        # 8-byte alignment keeps struct reads over the mapping aligned.
+        body += b"\0" * (-(HEADER_SIZE + len(body)) % 8)
+        table += SECTION.pack(HEADER_SIZE + len(body), len(payloads[name]))
+        body += payloads[name]
+    index = bytes(table + body)
+
+    summary = {key: meta[key] for key in ("node_count", "edge_count", "hub_count")}
+    summary.update(
+        {
+            "layer_count": len(layers_meta),
+            "truncated_hubs": truncated_hubs,
+            "hood_entries": len(hood_nodes),
+            "index_bytes": len(index),
+        }
+    )
+    return index, summary
+
+
+class NeighborhoodIndex:
+    """Read-only view over a neighborhood index through ``mmap``.
+
+    Entity lookups binary-search the layer's sorted node table; adjacency and hub
+    neighborhoods are read straight from the mapping.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            try:
+                self.data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise NeighborhoodError(f"cannot map {path}: {exc}") from None
+        try:
+            self.read_header()
+        except BaseException:
+            self.data.close()
+            raise
+
+    def read_header(self) -> None:
+        if len(self.data) < HEADER_SIZE:
+            raise NeighborhoodError("file is shorter than the index header")
+        magic, version, count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise NeighborhoodError("bad magic")
+        if version != VERSION or count != len(SECTIONS):
+            raise NeighborhoodError(f"unsupported index version {version} with {count} sections")
+        self.sections: dict[str, tuple[int, int]] = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(self.data, HEADER.size + i * SECTION.size)
+            if offset + length > len(self.data):
+                raise NeighborhoodError(f"section {name} runs past end of file")
+            self.sections[name] = (offset, length)
+        self.meta = json.loads(self.data[slice(*self.span("meta"))].decode("utf-8"))
+        self.layers = {entry["id"]: entry for entry in self.meta["layers"]}
+        self.string_count = self.sections["string_offsets"][1] // U64.size - 1
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __enter__(self) -> NeighborhoodIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def span(self, name: str) -> tuple[int, int]:
+        offset, length = self.sections[name]
+        return offset, offset + length
+
+    def u32(self, section: str, index: int) -> int:
+        return U32.unpack_from(self.data, self.sections[section][0] + index * U32.size)[0]
+
+    def u64(self, section: str, index: int) -> int:
+        return U64.unpack_from(self.data, self.sections[section][0] + index * U64.size)[0]
+
+    def string(self, index: int) -> str:
+        if not 0 <= index < self.string_count:
+            raise NeighborhoodError(f"string index {index} out of range")
+        start, end = self.u64("string_offsets", index), self.u64("string_offsets", index + 1)
+        data_at = self.sections["string_data"][0]
+        return self.data[data_at + start : data_at + end].decode("utf-8")
+
+    def entity(self, layer: dict[str, Any], node: int) -> str:
+        return self.string(self.u32("nodes", layer["node_base"] + node))
+
+    def layer(self, layer_id: str) -> dict[str, Any]:
+        entry = self.layers.get(layer_id)
+        if entry is None:
+            raise NeighborhoodError(f"unknown layer {layer_id}")
+        return entry
+
+    def find(self, layer_id: str, entity_id: str) -> int | None:
+        """Layer-local node index of ``entity_id``, by binary search over UTF-8 bytes."""
+        layer = self.layer(layer_id)
+        target = entity_id.encode("utf-8")
+        lo, hi = 0, layer["node_count"]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = self.entity(layer, mid).encode("utf-8")
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def neighbors(self, layer_id: str, entity_id: str) -> list[tuple[str, str]] | None:
+        """``(neighbor_id, assertion_id)`` pairs for ``entity_id`` in ``layer_id``."""
+        node = self.find(layer_id, entity_id)
+        if node is None:
+            return None
+        layer = self.layer(layer_id)
+        base = layer["node_base"] + node
+        start, end = self.u64("offsets", base), self.u64("offsets", base + 1)
+        return [
+            (self.entity(layer, self.u32("targets", i)), self.string(self.u32("edge_assertions", i)))
+            for i in range(start, end)
+        ]
+
+    def neighborhood(self, layer_id: str, entity_id: str, hops: int | None = None) -> dict[str, Any] | None:
+        """Precomputed neighborhood of a hub as node ids per hop, or ``None`` if it is not a hub."""
+        node = self.find(layer_id, entity_id)
+        if node is None:
+            return None
+        layer = self.layer(layer_id)
+        lo, hi = layer["hub_base"], layer["hub_base"] + layer["hub_count"]
+        hubs_at = self.sections["hubs"][0]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            hub_node, first, count, flags = HUB_ENTRY.unpack_from(self.data, hubs_at + mid * HUB_ENTRY.size)
+            if hub_node < node:
+                lo = mid + 1
+            elif hub_node > node:
+                hi = mid
+            else:
+                limit = self.meta["max_hops"] if hops is None else min(hops, self.meta["max_hops"])
+                by_hop: list[list[str]] = [[] for _ in range(limit + 1)]
+                hops_at = self.sections["hood_hops"][0]
+                for i in range(first, first + count):
+                    hop = self.data[hops_at + i]
+                    if hop <= limit:
+                        by_hop[hop].append(self.entity(layer, self.u32("hood_nodes", i)))
+                return {"entity_id": entity_id, "truncated": bool(flags & HUB_TRUNCATED), "hops": by_hop}
+        return None
+
+    def assertion_ids(self) -> set[str]:
+        """Every assertion id referenced by an adjacency entry."""
+        count = self.sections["edge_assertions"][1] // U32.size
+        return {self.string(index) for index in {self.u32("edge_assertions", i) for i in range(count)}}
+
+    def verify(self) -> list[str]:
+        """Structural checks: sorted nodes, monotone in-range offsets, symmetric edges, consistent hubs."""
+        problems: list[str] = []
+        node_total = self.sections["nodes"][1] // U32.size
+        edge_total = self.sections["targets"][1] // U32.size
+        hub_total = self.sections["hubs"][1] // HUB_ENTRY.size
+        hood_total = self.sections["hood_nodes"][1] // U32.size
+        if self.sections["offsets"][1] // U64.size != node_total + 1:
+            return [f"offsets hold {self.sections['offsets'][1] // U64.size} entries for {node_total} nodes"]
+        if self.sections["edge_assertions"][1] // U32.size != edge_total:
+            problems.append("edge_assertions and targets differ in length")
+        if self.sections["hood_hops"][1] != hood_total:
+            problems.append("hood_hops and hood_nodes differ in length")
+        if (self.meta.get("node_count"), self.meta.get("edge_count"), self.meta.get("hub_count")) != (
+            node_total,
+            edge_total,
+            hub_total,
+        ):
+            problems.append("meta counts do not match section sizes")
+        if problems:
+            return problems
+        for layer in self.meta["layers"]:
+            label = f"layer[{layer['id']}]"
+            base, count = layer["node_base"], layer["node_count"]
+            previous = b""
+            for node in range(count):
+                key = self.entity(layer, node).encode("utf-8")
+                if node and key <= previous:
+                    problems.append(f"{label} node {node} is not sorted after {previous.decode('utf-8')}")
+                previous = key
+            if self.u64("offsets", base) != layer["edge_base"]:
+                problems.append(f"{label} adjacency does not start at its edge_base")
+            if self.u64("offsets", base + count) != layer["edge_base"] + layer["edge_count"]:
+                problems.append(f"{label} adjacency does not end at edge_base + edge_count")
+            pairs: dict[tuple[int, int, int], int] = {}
+            for node in range(count):
+                start, end = self.u64("offsets", base + node), self.u64("offsets", base + node + 1)
+                if start > end or end > edge_total:
+                    problems.append(f"{label} node {node} has offsets {start}..{end} out of order or range")
+                    continue
+                for i in range(start, end):
+                    target = self.u32("targets", i)
+                    if target >= count:
+                        problems.append(f"{label} node {node} points past the layer's {count} nodes")
+                        continue
+                    key = (min(node, target), max(node, target), self.u32("edge_assertions", i))
+                    pairs[key] = pairs.get(key, 0) + 1
+            one_sided = sum(1 for (a, b, _), seen in pairs.items() if a != b and seen != 2)
+            if one_sided:
+                problems.append(f"{label} has {one_sided} edge(s) missing their reverse entry")
+            last_hub = -1
+            for h in range(layer["hub_base"], layer["hub_base"] + layer["hub_count"]):
+                node, first, size, _ = HUB_ENTRY.unpack_from(self.data, self.sections["hubs"][0] + h * HUB_ENTRY.size)
+                if node <= last_hub or node >= count:
+                    problems.append(f"{label} hub {h} node {node} is out of order or range")
+                last_hub = node
+                if first + size > hood_total or size == 0:
+                    problems.append(f"{label} hub {h} neighborhood is empty or runs past hood_nodes")
+                    continue
+                hops = self.data[self.sections["hood_hops"][0] + first : self.sections["hood_hops"][0] + first + size]
+                if self.u32("hood_nodes", first) != node or hops[0] != 0:
+                    problems.append(f"{label} hub {h} neighborhood does not start at the hub")
+                if any(b < a for a, b in zip(hops, hops[1:])) or max(hops) > self.meta["max_hops"]:
+                    problems.append(f"{label} hub {h} hops are not BFS ordered within max_hops")
+                if any(self.u32("hood_nodes", i) >= count for i in range(first, first + size)):
+                    problems.append(f"{label} hub {h} neighborhood points past the layer's nodes")
+        return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default="public/data", help="Directory containing compiled artifacts")
+    parser.add_argument("--out", help="Index path to write")
+    parser.add_argument("--max-hops", type=int, default=DEFAULT_MAX_HOPS, help="Hops precomputed per hub")
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=DEFAULT_MAX_NODES,
+        help="Total cap on each hub neighborhood, hub included, across all hops (BFS order)",
+    )
+    parser.add_argument(
+        "--hub-degree",
+        type=int,
+        default=DEFAULT_HUB_DEGREE,
+        help="Entities with at least this many adjacency entries in a layer get a precomputed neighborhood",
+    )
+    parser.add_argument("--index", help="Existing index to query (with --entity)")
+    parser.add_argument("--layer", default="canon", help="Layer to query")
+    parser.add_argument("--entity", action="append", default=[], help="Entity id to print from --index")
+    parser.add_argument("--report", help="Optional path to write JSON report")
+    args = parser.parse_args()
+
+    if args.entity:
+        if not args.index:
+            parser.error("--entity requires --index")
+        with NeighborhoodIndex(Path(args.index)) as index:
+            result: dict[str, Any] = {
+                entity_id: {
+                    "neighbors": index.neighbors(args.layer, entity_id),
+                    "neighborhood": index.neighborhood(args.layer, entity_id),
+                }
+                for entity_id in args.entity
+            }
+        print(json.dumps(result, indent=2))
+        return 0 if all(value["neighbors"] is not None for value in result.values()) else 1
+
+    if not args.out:
+        parser.error("--out is required when building")
+    if args.max_hops < 1 or args.max_hops > 255 or args.max_nodes < 1:
+        parser.error("--max-hops must be 1-255 and --max-nodes at least 1")
+    errors: list[str] = []
+    summary: dict[str, Any] = {}
+    try:
+        index, summary = build_index(Path(args.data_dir), args.max_hops, args.max_nodes, args.hub_degree)
+    except (NeighborhoodError, ValueError) as exc:
+        errors.append(str(exc))
+    else:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_bytes(index)
+
+    report = {
+        "data_dir": str(args.data_dir),
+        "out": str(args.out),
+        "error_count": len(errors),
+        "errors": errors,
+        "summary": summary,
+    }
+    payload = json.dumps(report, indent=2)
+    print(payload)
+    if args.report:
+        Path(args.report).write_text(payload, encoding="utf-8")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,24 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import re
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, TextIO
 
+try:
+    import numpy as np
+except ImportError:  # optional: only the numpy engine needs it
+    np = None
+
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
 
 MODE_TOKENS = {
     "dynasty": [
@@ -72,16 +85,72 @@ def extract_relation_type(assertion: dict[str, Any]) -> str:
     return ""
 
 
+class RelationScorer:
+    """Score relations against ``MODE_TOKENS`` with one compiled pattern and a memo table.
+
+    Corpora repeat a few dozen ``(predicate, rel_type)`` pairs, so each distinct pair is
+    scanned once per mode and every later assertion costs one dict lookup.
+    """
+
+    def __init__(self, mode_tokens: dict[str, list[str]]) -> None:
+        self.mode_tokens = mode_tokens
+        tokens = sorted({t for group in mode_tokens.values() for t in group if t}, key=len, reverse=True)
+        # Longest-first alternation in a lookahead reports the longest token starting at each
+        # offset; any shorter token starting there is its prefix, so ``contained`` recovers it.
+        alternation = "|".join(re.escape(t) for t in tokens)
+        self.pattern = re.compile(f"(?=({alternation}))") if tokens else None
+        self.contained = {t: frozenset(other for other in tokens if other in t) for t in tokens}
+        self.memo: dict[tuple[str, str, str], int] = {}
+
+    def tokens_in(self, text: str) -> frozenset[str]:
+        if self.pattern is None or not text:
+            return frozenset()
+        found: set[str] = set()
+        for hit in self.pattern.findall(text):
+            found |= self.contained[hit]
+        return frozenset(found)
+
+    def score(self, predicate: str, rel_type: str, mode: str) -> int:
+        key = (predicate, rel_type, mode)
+        score = self.memo.get(key)
+        if score is None:
+            score = self.memo[key] = self._score(predicate, rel_type, mode)
+        return score
+
+    def _score(self, predicate: str, rel_type: str, mode: str) -> int:
+        in_predicate = self.tokens_in(predicate)
+        in_rel_type = self.tokens_in(rel_type)
+        score = 0
+        for token in self.mode_tokens[mode]:
+            hit = not token or token in in_predicate  # "" is a substring of every predicate
+            if hit:
+                score += 2
+            if token and token in in_rel_type:
+                score += 3
+            if token == mode and hit:
+                score += 4
+        return score
+
+
+SCORER = RelationScorer(MODE_TOKENS)
+
+
 def score_mode(predicate: str, rel_type: str, mode: str) -> int:
-    score = 0
-    for token in MODE_TOKENS[mode]:
-        if token in predicate:
-            score += 2
-        if token and token in rel_type:
-            score += 3
-        if token == mode and token in predicate:
-            score += 4
-    return score
+    return SCORER.score(predicate, rel_type, mode)
+
+
+def extract_layer(assertion: dict[str, Any]) -> str:
+    direct = assertion.get("layer")
+    if isinstance(direct, str):
+        return direct
+    ext = assertion.get("extensions")
+    if isinstance(ext, dict):
+        psellos = ext.get("psellos")
+        if isinstance(psellos, dict):
+            layer = psellos.get("layer")
+            if isinstance(layer, str):
+                return layer
+    return "canon"
 
 
 def normalize_entity_id(assertion: dict[str, Any], key: str) -> str | None:
@@ -94,25 +163,12 @@ def normalize_entity_id(assertion: dict[str, Any], key: str) -> str | None:
     return None
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--assertions", required=True, help="Path to assertions JSON file")
-    parser.add_argument(
-        "--mode",
-        choices=("all", "dynasty", "workplace"),
-        default="all",
-        help="Mode to compute",
-    )
-    parser.add_argument("--threshold", type=int, default=1, help="Minimum score to include membership")
-    parser.add_argument("--output", help="Optional output file path")
-    args = parser.parse_args()
-
-    assertions = load_assertions(Path(args.assertions))
-    modes = ["dynasty", "workplace"] if args.mode == "all" else [args.mode]
+Relation = tuple[str, str, str, str, str, str]  # assertion id, subject, object, predicate, rel_type, layer
 
-    scores: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-    evidence: list[dict[str, Any]] = []
 
+def relation_rows(assertions: list[dict[str, Any]]) -> list[Relation]:
+    """Extract the fields scoring needs, skipping assertions without both endpoints."""
+    rows: list[Relation] = []
     for assertion in assertions:
         subject = normalize_entity_id(assertion, "subject")
         obj = normalize_entity_id(assertion, "object")
@@ -120,39 +176,593 @@ def main() -> int:
             continue
         predicate = str(assertion.get("predicate", "")).lower()
         rel_type = extract_relation_type(assertion)
-        assertion_id = str(assertion.get("id", ""))
+        layer = extract_layer(assertion)
+        rows.append((str(assertion.get("id", "")), subject, obj, predicate, rel_type, layer))
+    return rows
+
+
+def changed_rows(path: Path, changed: set[str]) -> list[Relation]:
+    """Relation rows of the ``changed`` assertions only, streaming ``path`` so no other record is kept."""
+    json_stream = skill_module("artifact-contract-auditor", "json_stream")
+    selected: list[dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as handle:
+        stream = json_stream.JsonStream(handle)
+        # Keyed records take their key as id unless they carry one, as in ``load_assertions``.
+        if stream.peek() == "[":
+            records: Iterable[tuple[str, Any]] = (("", record) for record in stream.iter_array())
+        elif stream.peek() == "{":
+            records = stream.iter_object()
+        else:
+            raise ValueError(f"Unsupported assertion file structure in {path}")
+        for key, record in records:
+            if isinstance(record, dict) and str(record.get("id", key)) in changed:
+                item = dict(record)
+                item.setdefault("id", key)
+                selected.append(item)
+    return relation_rows(selected)
+
+
+def evidence_row(assertion_id: str, mode: str, subject: str, obj: str, delta: int) -> dict[str, Any]:
+    return {"assertion_id": assertion_id, "mode": mode, "subject": subject, "object": obj, "delta": delta}
+
+
+# Engines report each evidence row as emit(assertion_id, mode, subject, object, delta).
+Emit = Callable[[str, str, str, str, int], None]
+
 
+class GroupedEvidence:
+    """Evidence as assertion-id references per entity and mode instead of one row per hit."""
+
+    def __init__(self) -> None:
+        self.refs: dict[str, dict[str, list[str]]] = defaultdict(lambda: defaultdict(list))
+        self.count = 0
+
+    def __call__(self, assertion_id: str, mode: str, subject: str, obj: str, delta: int) -> None:
+        self.count += 1
+        self.refs[subject][mode].append(assertion_id)
+        if obj != subject:
+            self.refs[obj][mode].append(assertion_id)
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        for entity_id, mode_map in sorted(self.refs.items()):
+            for mode, assertion_ids in sorted(mode_map.items()):
+                yield {"entity_id": entity_id, "mode": mode, "assertion_ids": assertion_ids}
+
+
+class NdjsonEvidence:
+    """Write flat evidence rows to an NDJSON handle as they are produced."""
+
+    def __init__(self, handle: TextIO) -> None:
+        self.handle = handle
+        self.count = 0
+
+    def __call__(self, assertion_id: str, mode: str, subject: str, obj: str, delta: int) -> None:
+        self.count += 1
+        self.handle.write(json.dumps(evidence_row(assertion_id, mode, subject, obj, delta)) + "\n")
+
+
+def read_ndjson(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+# NdjsonEvidence writes ``assertion_id`` first, so a row's id can be decoded without the rest of the line.
+EVIDENCE_PREFIX = '{"assertion_id": '
+DECODER = json.JSONDecoder()
+
+
+def read_touched_evidence(path: Path, touched: set[str]) -> Iterator[dict[str, Any]]:
+    """Yield the NDJSON evidence rows of ``touched`` assertions; other rows are skipped after reading their id."""
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.startswith(EVIDENCE_PREFIX):
+                if DECODER.raw_decode(line, len(EVIDENCE_PREFIX))[0] not in touched:
+                    continue
+            elif not line.strip():
+                continue
+            item = json.loads(line)
+            if item["assertion_id"] in touched:
+                yield item
+
+
+def score_python(
+    rows: list[Relation], modes: list[str], threshold: int, emit: Emit | None = None
+) -> list[dict[str, Any]]:
+    """Reference engine: per-assertion dict accumulation. Returns memberships; evidence goes to ``emit``."""
+    scores: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    score = SCORER.score
+
+    for assertion_id, subject, obj, predicate, rel_type, _ in rows:
         for mode in modes:
-            delta = score_mode(predicate, rel_type, mode)
+            delta = score(predicate, rel_type, mode)
             if delta <= 0:
                 continue
             scores[subject][mode] += delta
             scores[obj][mode] += delta
-            evidence.append(
+            if emit is not None:
+                emit(assertion_id, mode, subject, obj, delta)
+
+    memberships = []
+    for entity_id, mode_map in sorted(scores.items()):
+        for mode, total in sorted(mode_map.items()):
+            if total >= threshold:
+                memberships.append({"entity_id": entity_id, "mode": mode, "score": total})
+    return memberships
+
+
+def score_numpy(
+    rows: list[Relation], modes: list[str], threshold: int, emit: Emit | None = None
+) -> list[dict[str, Any]]:
+    """Vectorized engine with output identical to ``score_python``.
+
+    Entities and distinct ``(predicate, rel_type)`` pairs become integer codes; each pair
+    code indexes a precomputed per-mode score row, and totals are scatter-added into an
+    entities x modes matrix that is thresholded with one mask.
+    """
+    entity_codes: dict[str, int] = {}
+    relation_codes: dict[tuple[str, str], int] = {}
+    subjects = np.fromiter((entity_codes.setdefault(row[1], len(entity_codes)) for row in rows), np.int64, len(rows))
+    objects = np.fromiter((entity_codes.setdefault(row[2], len(entity_codes)) for row in rows), np.int64, len(rows))
+    relations = np.fromiter(
+        (relation_codes.setdefault((row[3], row[4]), len(relation_codes)) for row in rows), np.int64, len(rows)
+    )
+    table = np.array(
+        [[SCORER.score(predicate, rel_type, mode) for mode in modes] for predicate, rel_type in relation_codes],
+        dtype=np.int64,
+    ).reshape(len(relation_codes), len(modes))
+    deltas = table[relations]
+
+    totals = np.zeros((len(entity_codes), len(modes)), dtype=np.int64)
+    for column in range(len(modes)):
+        # bincount sums in float64, which is exact for any realistic score total.
+        weights = deltas[:, column]
+        totals[:, column] += np.bincount(subjects, weights, len(entity_codes)).astype(np.int64)
+        totals[:, column] += np.bincount(objects, weights, len(entity_codes)).astype(np.int64)
+
+    if emit is not None:
+        # Row-major nonzero keeps evidence in assertion order, then mode order.
+        hit_rows, hit_modes = np.nonzero(deltas > 0)
+        for i, k in zip(hit_rows.tolist(), hit_modes.tolist()):
+            assertion_id, subject, obj = rows[i][:3]
+            emit(assertion_id, modes[k], subject, obj, int(deltas[i, k]))
+
+    entity_ids = list(entity_codes)
+    entity_order = sorted(range(len(entity_ids)), key=entity_ids.__getitem__)
+    mode_order = sorted(range(len(modes)), key=modes.__getitem__)
+    ordered = totals[np.array(entity_order, dtype=np.int64)][:, mode_order]
+    # Only entity/mode pairs with evidence exist in the reference engine's dicts.
+    keep_rows, keep_modes = np.nonzero((ordered > 0) & (ordered >= threshold))
+    memberships = [
+        {"entity_id": entity_ids[entity_order[e]], "mode": modes[mode_order[m]], "score": int(ordered[e, m])}
+        for e, m in zip(keep_rows.tolist(), keep_modes.tolist())
+    ]
+    return memberships
+
+
+ENGINES = {"python": score_python, "numpy": score_numpy}
+
+
+class UnionFind:
+    """Disjoint sets over string ids with union by size and path halving."""
+
+    def __init__(self) -> None:
+        self.parent: dict[str, str] = {}
+        self.size: dict[str, int] = {}
+
+    def find(self, item: str) -> str:
+        parent = self.parent
+        if item not in parent:
+            parent[item] = item
+            self.size[item] = 1
+            return item
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: str, b: str) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def groups(self) -> list[list[str]]:
+        members: dict[str, list[str]] = defaultdict(list)
+        for item in self.parent:
+            members[self.find(item)].append(item)
+        return [sorted(group) for group in members.values()]
+
+
+def extract_clusters(
+    rows: list[Relation], modes: list[str], edge_threshold: int, min_size: int
+) -> list[dict[str, Any]]:
+    """Connected groups of entities per mode and layer, joined by assertions scoring at least ``edge_threshold``.
+
+    A cluster id is ``mode/layer/<smallest member id>``, so it stays put across runs while
+    that member remains in the cluster. Clusters are sorted by mode, layer, then id.
+    """
+    forests: dict[tuple[str, str], UnionFind] = defaultdict(UnionFind)
+    score = SCORER.score
+    for _, subject, obj, predicate, rel_type, layer in rows:
+        for mode in modes:
+            if score(predicate, rel_type, mode) >= max(edge_threshold, 1):
+                forests[(mode, layer)].union(subject, obj)
+
+    clusters = []
+    for (mode, layer), forest in sorted(forests.items()):
+        groups = sorted(group for group in forest.groups() if len(group) >= min_size)
+        for members in groups:
+            clusters.append(
                 {
-                    "assertion_id": assertion_id,
+                    "cluster_id": f"{mode}/{layer}/{members[0]}",
                     "mode": mode,
-                    "subject": subject,
-                    "object": obj,
-                    "delta": delta,
+                    "layer": layer,
+                    "size": len(members),
+                    "members": members,
                 }
             )
+    return clusters
 
-    memberships = []
-    for entity_id, mode_map in sorted(scores.items()):
-        for mode, score in sorted(mode_map.items()):
-            if score >= args.threshold:
-                memberships.append({"entity_id": entity_id, "mode": mode, "score": score})
 
-    result = {
+def diff_assertions(previous: list[dict[str, Any]], current: list[dict[str, Any]]) -> tuple[set[str], set[str]]:
+    """Return ``(changed, removed)`` assertion ids between two assertion files; new ids count as changed."""
+    before = {str(item.get("id", "")): item for item in previous}
+    after = {str(item.get("id", "")): item for item in current}
+    changed = {assertion_id for assertion_id, item in after.items() if before.get(assertion_id) != item}
+    return changed, set(before) - set(after)
+
+
+Totals = dict[tuple[str, str], int]  # (entity id, mode) -> score, for every pair with evidence
+
+
+def split_threshold(pairs: list[dict[str, Any]], threshold: int) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Split scored ``{entity_id, mode, score}`` pairs into memberships and the pairs below ``threshold``."""
+    memberships = [pair for pair in pairs if pair["score"] >= threshold]
+    return memberships, [pair for pair in pairs if pair["score"] < threshold]
+
+
+def previous_totals(previous: dict[str, Any], threshold: int) -> Totals:
+    """Per-pair totals of an earlier result: its memberships plus its ``below_threshold`` pairs."""
+    if threshold > 1 and not isinstance(previous.get("below_threshold"), list):
+        raise ValueError("--previous has no below_threshold totals; recompute it with this version of the script")
+    pairs = chain(previous["memberships"], previous.get("below_threshold", []))
+    return {(pair["entity_id"], pair["mode"]): pair["score"] for pair in pairs}
+
+
+def apply_delta(
+    totals: Totals,
+    touched_evidence: Iterable[dict[str, Any]],
+    changed: list[Relation],
+    modes: list[str],
+    threshold: int,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Update ``totals`` in place for touched assertions without looking at any other assertion.
+
+    ``touched_evidence`` holds the previous evidence rows of changed and removed assertions,
+    whose deltas are taken back out; ``changed`` holds the current rows of changed assertions,
+    which are scored again. Only the (entity, mode) pairs those rows name are updated.
+    Returns ``(changed_memberships, evidence)``, the latter being the changed rows' new evidence.
+    """
+    before: Totals = {}
+
+    def adjust(entity_id: str, mode: str, delta: int) -> None:
+        key = (entity_id, mode)
+        total = totals.get(key, 0)
+        before.setdefault(key, total)
+        totals[key] = total + delta
+
+    for item in touched_evidence:
+        adjust(item["subject"], item["mode"], -item["delta"])
+        adjust(item["object"], item["mode"], -item["delta"])
+    evidence: list[dict[str, Any]] = []
+    for assertion_id, subject, obj, predicate, rel_type, _ in changed:
+        for mode in modes:
+            delta = SCORER.score(predicate, rel_type, mode)
+            if delta <= 0:
+                continue
+            adjust(subject, mode, delta)
+            adjust(obj, mode, delta)
+            evidence.append(evidence_row(assertion_id, mode, subject, obj, delta))
+
+    # Every delta is positive, so a zero total means the pair has no evidence left.
+    changed_memberships = []
+    for (entity_id, mode), old_total in sorted(before.items()):
+        total = totals[(entity_id, mode)]
+        if not total:
+            del totals[(entity_id, mode)]
+        old = old_total if old_total and old_total >= threshold else None
+        new = total if total and total >= threshold else None
+        if old != new:
+            changed_memberships.append({"entity_id": entity_id, "mode": mode, "previous_score": old, "score": new})
+    return changed_memberships, evidence
+
+
+def merge_evidence(
+    kept: list[dict[str, Any]], evidence: list[dict[str, Any]], rows: list[Relation], modes: list[str]
+) -> list[dict[str, Any]]:
+    """Previous evidence rows that were kept plus the changed rows' new ones, in full-recompute order."""
+    position = {row[0]: index for index, row in enumerate(rows)}
+    missing = next((item["assertion_id"] for item in kept if item["assertion_id"] not in position), None)
+    if missing is not None:
+        raise ValueError(f"assertion {missing} from --previous is not in --assertions; list it as changed or removed")
+    mode_index = {mode: i for i, mode in enumerate(modes)}
+    merged = kept + evidence
+    merged.sort(key=lambda item: (position[item["assertion_id"]], mode_index[item["mode"]]))
+    return merged
+
+
+LayerTask = tuple[str, list[Relation], list[str], int, str, str, tuple[int, int] | None]
+
+
+def score_layer(task: LayerTask) -> tuple[str, dict[str, Any]]:
+    """Score one layer's rows; runs in a worker process under ``--all-layers --jobs``."""
+    layer, rows, modes, threshold, engine, evidence, cluster_options = task
+    flat: list[dict[str, Any]] = []
+
+    def collect(*hit: Any) -> None:
+        flat.append(evidence_row(*hit))
+
+    emit: Emit | None = {"flat": collect, "grouped": GroupedEvidence(), "none": None}[evidence]
+    memberships = ENGINES[engine](rows, modes, threshold, emit)
+    result: dict[str, Any] = {"membership_count": len(memberships), "memberships": memberships}
+    if isinstance(emit, GroupedEvidence):
+        result["evidence"] = list(emit.rows())
+    elif evidence == "flat":
+        result["evidence"] = flat
+    if cluster_options is not None:
+        clusters = extract_clusters(rows, modes, *cluster_options)
+        result["cluster_count"] = len(clusters)
+        result["clusters"] = clusters
+    return layer, result
+
+
+def score_all_layers(
+    rows: list[Relation], by_layer: dict[str, list[str]], jobs: int, task_args: tuple[Any, ...]
+) -> dict[str, dict[str, Any]]:
+    """Score every layer of ``assertions_by_layer.json`` from one loaded corpus.
+
+    Layer is a hard filter, so each layer sees only its indexed assertions; rows take the
+    index's layer id. Results keep the index's layer order whatever ``jobs`` is.
+    """
+    by_id = {row[0]: row for row in rows}
+    tasks: list[LayerTask] = []
+    for layer, assertion_ids in by_layer.items():
+        subset = [by_id[x][:5] + (layer,) for x in assertion_ids if x in by_id]
+        tasks.append((layer, subset, *task_args))
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            return dict(pool.map(score_layer, tasks))
+    return dict(map(score_layer, tasks))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assertions", required=True, help="Path to assertions JSON file")
+    parser.add_argument(
+        "--mode",
+        choices=("all", "dynasty", "workplace"),
+        default="all",
+        help="Mode to compute",
+    )
+    parser.add_argument("--threshold", type=int, default=1, help="Minimum score to include membership")
+    parser.add_argument("--output", help="Optional output file path")
+    parser.add_argument(
+        "--engine",
+        choices=("auto", "python", "numpy"),
+        default="auto",
+        help="Scoring engine; auto uses numpy when it is installed (output is identical)",
+    )
+    parser.add_argument("--previous", help="Earlier result JSON to update incrementally instead of recomputing")
+    parser.add_argument(
+        "--changed",
+        action="append",
+        default=[],
+        help="Comma-separated ids of added or modified assertions (with --previous; repeatable)",
+    )
+    parser.add_argument(
+        "--removed",
+        action="append",
+        default=[],
+        help="Comma-separated ids of deleted assertions (with --previous; repeatable)",
+    )
+    parser.add_argument(
+        "--previous-assertions",
+        help="Assertions file the --previous result was computed from; changed/removed ids are diffed from it",
+    )
+    parser.add_argument(
+        "--previous-evidence",
+        help="NDJSON evidence written by the --previous run with --evidence-out (default: its inline evidence)",
+    )
+    parser.add_argument(
+        "--full-output",
+        action="store_true",
+        help="With --previous, emit the whole updated result instead of only the changed memberships",
+    )
+    parser.add_argument(
+        "--evidence",
+        choices=("flat", "grouped", "none"),
+        default="flat",
+        help="Evidence shape: one row per hit, assertion ids grouped per entity and mode, or omitted",
+    )
+    parser.add_argument(
+        "--evidence-out",
+        help="Write evidence to this NDJSON file as it is produced instead of embedding it in the result",
+    )
+    parser.add_argument("--compact", action="store_true", help="Emit the result JSON without indentation")
+    parser.add_argument(
+        "--clusters",
+        action="store_true",
+        help="Also emit connected entity clusters per mode and layer",
+    )
+    parser.add_argument(
+        "--edge-threshold",
+        type=int,
+        default=1,
+        help="Minimum per-assertion score for an assertion to join two entities in --clusters",
+    )
+    parser.add_argument("--min-cluster-size", type=int, default=2, help="Smallest cluster to emit with --clusters")
+    parser.add_argument(
+        "--all-layers",
+        action="store_true",
+        help="Score each layer of the layer index separately and emit one result keyed by layer",
+    )
+    parser.add_argument(
+        "--layer-index",
+        help="assertions_by_layer.json for --all-layers (default: next to --assertions)",
+    )
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for --all-layers (0 = all cores)")
+    args = parser.parse_args()
+    if args.engine == "numpy" and np is None:
+        parser.error("--engine numpy requires numpy to be installed")
+    engine = args.engine if args.engine != "auto" else ("numpy" if np is not None else "python")
+    if (args.changed or args.removed or args.previous_assertions) and not args.previous:
+        parser.error("--changed, --removed and --previous-assertions require --previous")
+    if args.evidence_out and args.evidence == "none":
+        parser.error("--evidence-out needs --evidence flat or grouped")
+    if args.all_layers and (args.previous or args.evidence_out):
+        parser.error("--all-layers cannot be combined with --previous or --evidence-out")
+    if args.full_output and not args.previous:
+        parser.error("--full-output requires --previous")
+    if args.previous and not args.full_output and (args.evidence_out or args.clusters):
+        parser.error("--evidence-out and --clusters with --previous need --full-output")
+
+    modes = ["dynasty", "workplace"] if args.mode == "all" else [args.mode]
+    # A delta run reads the whole corpus only to diff it or to order the full output.
+    assertions: list[dict[str, Any]] | None = None
+    if not args.previous or args.full_output or args.previous_assertions:
+        assertions = load_assertions(Path(args.assertions))
+    rows = relation_rows(assertions) if assertions is not None else []
+
+    if args.all_layers:
+        index_path = Path(args.layer_index or Path(args.assertions).with_name("assertions_by_layer.json"))
+        by_layer = json.loads(index_path.read_text(encoding="utf-8"))
+        if not isinstance(by_layer, dict):
+            parser.error(f"{index_path} must map layer ids to assertion id lists")
+        cluster_options = (args.edge_threshold, args.min_cluster_size) if args.clusters else None
+        task_args = (modes, args.threshold, engine, args.evidence, cluster_options)
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        layers = score_all_layers(rows, by_layer, jobs, task_args)
+        result = {"mode": args.mode, "threshold": args.threshold, "layer_count": len(layers), "layers": layers}
+        payload = json.dumps(result, indent=None if args.compact else 2)
+        print(payload)
+        if args.output:
+            Path(args.output).write_text(payload, encoding="utf-8")
+        return 0
+
+    delta_summary = None
+    if args.previous:
+        previous = json.loads(Path(args.previous).read_text(encoding="utf-8"))
+        if previous.get("mode") != args.mode or previous.get("threshold") != args.threshold:
+            parser.error("--previous was computed with a different --mode or --threshold")
+        inline = previous.get("evidence")
+        if not args.previous_evidence and not (
+            isinstance(inline, list) and all("delta" in item for item in inline[:1])
+        ):
+            parser.error("--previous must contain flat evidence, or pass its NDJSON with --previous-evidence")
+        changed = {x for value in args.changed for x in value.split(",") if x}
+        removed = {x for value in args.removed for x in value.split(",") if x}
+        if assertions is not None and args.previous_assertions:
+            before = load_assertions(Path(args.previous_assertions))
+            diffed_changed, diffed_removed = diff_assertions(before, assertions)
+            changed |= diffed_changed
+            removed |= diffed_removed
+        touched = changed | removed
+        try:
+            totals = previous_totals(previous, args.threshold)
+            if assertions is not None:
+                changed_relations = [row for row in rows if row[0] in changed]
+            else:
+                changed_relations = changed_rows(Path(args.assertions), changed)
+            if args.full_output:
+                previous_rows = list(read_ndjson(Path(args.previous_evidence))) if args.previous_evidence else inline
+                kept = [item for item in previous_rows if item["assertion_id"] not in touched]
+                touched_rows: Iterable[dict[str, Any]] = (
+                    item for item in previous_rows if item["assertion_id"] in touched
+                )
+            elif args.previous_evidence:
+                touched_rows = read_touched_evidence(Path(args.previous_evidence), touched)
+            else:
+                touched_rows = (item for item in inline if item["assertion_id"] in touched)
+            changed_memberships, changed_evidence = apply_delta(
+                totals, touched_rows, changed_relations, modes, args.threshold
+            )
+            if args.full_output:
+                delta_evidence = merge_evidence(kept, changed_evidence, rows, modes)
+        except ValueError as exc:
+            parser.error(str(exc))
+        delta_summary = {
+            "changed_assertions": len(changed),
+            "removed_assertions": len(removed),
+            "changed_membership_count": len(changed_memberships),
+            "changed_memberships": changed_memberships,
+        }
+        if not args.full_output:
+            result = {"mode": args.mode, "threshold": args.threshold, "delta": delta_summary}
+            payload = json.dumps(result, indent=None if args.compact else 2)
+            print(payload)
+            if args.output:
+                Path(args.output).write_text(payload, encoding="utf-8")
+            return 0
+        pairs = [{"entity_id": e, "mode": m, "score": score} for (e, m), score in sorted(totals.items())]
+
+    # Opened only after any --previous-evidence has been read, so both may name one file.
+    handle = Path(args.evidence_out).open("w", encoding="utf-8") if args.evidence_out else None
+    try:
+        flat: list[dict[str, Any]] = []
+
+        def collect(*hit: Any) -> None:
+            flat.append(evidence_row(*hit))
+
+        emit: Emit | None = None
+        if args.evidence == "grouped":
+            emit = GroupedEvidence()
+        elif handle is not None:
+            emit = NdjsonEvidence(handle)
+        elif args.evidence == "flat":
+            emit = collect
+        if args.previous:
+            if emit is not None:
+                for item in delta_evidence:
+                    emit(item["assertion_id"], item["mode"], item["subject"], item["object"], item["delta"])
+        else:
+            # Scored at threshold 1 so the pairs below --threshold are kept for a later --previous run.
+            pairs = ENGINES[engine](rows, modes, 1, emit)
+        if isinstance(emit, GroupedEvidence) and handle is not None:
+            for row in emit.rows():
+                handle.write(json.dumps(row) + "\n")
+    finally:
+        if handle is not None:
+            handle.close()
+
+    memberships, below_threshold = split_threshold(pairs, args.threshold)
+    result: dict[str, Any] = {
         "mode": args.mode,
         "threshold": args.threshold,
         "membership_count": len(memberships),
         "memberships": memberships,
-        "evidence": evidence,
     }
+    if args.threshold > 1:
+        result["below_threshold"] = below_threshold
+    if handle is not None:
+        result["evidence_out"] = args.evidence_out
+        result["evidence_count"] = emit.count
+    elif isinstance(emit, GroupedEvidence):
+        result["evidence"] = list(emit.rows())
+    elif args.evidence == "flat":
+        result["evidence"] = flat
+    if args.clusters:
+        clusters = extract_clusters(rows, modes, args.edge_threshold, args.min_cluster_size)
+        result["cluster_count"] = len(clusters)
+        result["clusters"] = clusters
+    if delta_summary is not None:
+        result["delta"] = delta_summary
 
-    payload = json.dumps(result, indent=2)
+    payload = json.dumps(result, indent=None if args.compact else 2)
     print(payload)
     if args.output:
         Path(args.output).write_text(payload, encoding="utf-8")
@@ -1,8 +1,35 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import argparse, json
+import argparse, json, sys
 from pathlib import Path
 
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
+
+
+class Audit:
+    SUFFIXES = (".tsx",)
+
+    def __init__(self) -> None:
+        self.by_path: dict[Path, list[str]] = {}
+
+    def visit(self, path: Path, text: str) -> None:
+        warnings = []
+        if "IconButton" in text and "aria-label" not in text:
+            warnings.append(f"{path}: IconButton without aria-label marker")
+        if "Dialog" in text and "aria-" not in text:
+            warnings.append(f"{path}: Dialog without explicit aria marker")
+        self.by_path[path] = warnings
+
+    def forget(self, path: Path) -> None:
+        self.by_path.pop(path, None)
+
+    def finish(self) -> tuple[dict, int]:
+        warnings = [warning for path in sorted(self.by_path) for warning in self.by_path[path]]
+        return {"warning_count": len(warnings), "warnings": warnings}, 0
+
 
 def main() -> int:
     p = argparse.ArgumentParser()
@@ -10,24 +37,17 @@ def main() -> int:
     p.add_argument("--report")
     args = p.parse_args()
 
-    root = Path(args.root)
-    files = list(root.glob("src/**/*.tsx"))
-    warnings = []
-
-    for f in files:
-        text = f.read_text(encoding="utf-8", errors="ignore")
-        if "IconButton" in text and "aria-label" not in text:
-            warnings.append(f"{f}: IconButton without aria-label marker")
-        if "Dialog" in text and "aria-" not in text:
-            warnings.append(f"{f}: Dialog without explicit aria marker")
-
-    report = {"warning_count": len(warnings), "warnings": warnings}
+    audit = Audit()
+    # The shared source walker lives with the theme governor.
+    src_scan = skill_module("mui-theme-system-governor", "src_scan")
+    src_scan.scan_sources(Path(args.root), [audit])
+    report, exit_code = audit.finish()
     payload = json.dumps(report, indent=2)
     print(payload)
     if args.report:
         Path(args.report).write_text(payload, encoding="utf-8")
-    return 0
+    return exit_code
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
\ No newline at end of file
+    raise SystemExit(main())
@@ -1,7 +1,16 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import argparse, json
+import argparse, json, sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from doc_scan import DocumentScan
+
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
 
 REQUIRED_PHRASES = [
     "apply",
@@ -10,33 +19,39 @@ REQUIRED_PHRASES = [
     "url",
     "prompt",
 ]
+TARGET_DOCS = ["docs/UX_NAV_SPEC.md", "docs/OVERHAUL_PLAN.md"]
+PHRASES = {rel: REQUIRED_PHRASES for rel in TARGET_DOCS}
 
 
-def main() -> int:
-    p = argparse.ArgumentParser()
-    p.add_argument("--root", default=".")
-    p.add_argument("--report")
-    args = p.parse_args()
-
-    root = Path(args.root)
-    target_docs = [root / "docs/UX_NAV_SPEC.md", root / "docs/OVERHAUL_PLAN.md"]
-
+def evaluate(root: Path, scan: DocumentScan) -> tuple[dict, int]:
     errors = []
-    for path in target_docs:
-        if not path.exists():
+    for rel in TARGET_DOCS:
+        path = root / rel
+        if not scan.exists(rel):
             errors.append(f"Missing doc: {path}")
             continue
-        text = path.read_text(encoding="utf-8").lower()
         for phrase in REQUIRED_PHRASES:
-            if phrase not in text:
+            if not scan.contains(rel, phrase):
                 errors.append(f"{path} missing phrase: {phrase}")
 
     report = {"error_count": len(errors), "errors": errors}
+    return report, 1 if errors else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--root", default=".")
+    p.add_argument("--report")
+    args = p.parse_args()
+
+    root = Path(args.root)
+    doc_scan = skill_module("spec-adr-sync-checker", "doc_scan")
+    report, exit_code = evaluate(root, doc_scan.scan_documents(root, PHRASES))
     payload = json.dumps(report, indent=2)
     print(payload)
     if args.report:
         Path(args.report).write_text(payload, encoding="utf-8")
-    return 1 if errors else 0
+    return exit_code
 
 
 if __name__ == "__main__":
@@ -1,38 +1,116 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import argparse, json, re
+import argparse, json, mmap, re
+from bisect import bisect_right
+from collections import Counter
 from pathlib import Path
 
+from src_scan import DEFAULT_JOBS, read_sources, walk_sources
+
 HEX_RE = re.compile(r"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})\b")
+# ``\b`` on bytes only knows ASCII word characters, so the bytes pattern stops at an ASCII
+# boundary and ``word_follows`` applies the Unicode rule of the str pattern to the rest.
+HEX_BYTES_RE = re.compile(rb"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})(?![0-9A-Za-z_])")
+# Sources at least this large (usually generated) are memory-mapped by the standalone run instead of read.
+MMAP_MIN_BYTES = 1 << 20
+
+
+def line_starts(buffer: str | bytes | mmap.mmap) -> list[int]:
+    """Offsets at which each line begins; ``bisect_right(starts, offset)`` is the 1-based line of ``offset``."""
+    newline = "\n" if isinstance(buffer, str) else b"\n"
+    starts = [0]
+    pos = buffer.find(newline)
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = buffer.find(newline, pos + 1)
+    return starts
+
+
+def word_follows(buffer: bytes | mmap.mmap, end: int) -> bool:
+    """Whether the character decoded at byte ``end`` is a Unicode word character, as str ``\b`` sees it."""
+    if end >= len(buffer) or buffer[end] < 0x80:
+        return False
+    size = 4
+    while True:
+        tail = buffer[end : end + size].decode("utf-8", errors="ignore")
+        if tail:
+            return tail[0].isalnum() or tail[0] == "_"
+        if end + size >= len(buffer):
+            return False
+        size *= 2
+
+
+def raw_colors(buffer: str | bytes | mmap.mmap) -> list[tuple[int, int, str]]:
+    """Every raw hex color token in one pass over the buffer, as ``(line, column, lowercased token)``."""
+    text = isinstance(buffer, str)
+    hits = []
+    starts = None
+    for match in (HEX_RE if text else HEX_BYTES_RE).finditer(buffer):
+        if not text and word_follows(buffer, match.end()):
+            continue
+        if starts is None:
+            starts = line_starts(buffer)
+        line = bisect_right(starts, match.start())
+        prefix = buffer[starts[line - 1] : match.start()]
+        column = len(prefix if text else prefix.decode("utf-8", errors="ignore")) + 1
+        token = match.group() if text else match.group().decode("ascii")
+        hits.append((line, column, token.lower()))
+    return hits
+
+
+class Audit:
+    SUFFIXES = (".tsx", ".ts")
+
+    def __init__(self) -> None:
+        self.by_path: dict[Path, list[tuple[int, int, str]]] = {}
+
+    def visit(self, path: Path, text: str) -> None:
+        self.by_path[path] = raw_colors(text)
+
+    def visit_mapped(self, path: Path) -> None:
+        with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            self.by_path[path] = raw_colors(buffer)
+
+    def forget(self, path: Path) -> None:
+        self.by_path.pop(path, None)
+
+    def finish(self) -> tuple[dict, int]:
+        findings = []
+        colors: Counter[str] = Counter()
+        for path in sorted(self.by_path):
+            for line, column, token in self.by_path[path]:
+                findings.append(f"{path}:{line}:{column} raw color token {token}")
+                colors[token] += 1
+        report = {
+            "finding_count": len(findings),
+            "file_count": sum(1 for hits in self.by_path.values() if hits),
+            "color_counts": dict(sorted(colors.items(), key=lambda item: (-item[1], item[0]))),
+            "findings": findings,
+        }
+        return report, 0
 
 
 def main() -> int:
     p = argparse.ArgumentParser()
     p.add_argument("--root", default=".")
     p.add_argument("--report")
+    p.add_argument("--mmap-min-bytes", type=int, default=MMAP_MIN_BYTES)
     args = p.parse_args()
 
-    root = Path(args.root)
-    files = list(root.glob("src/**/*.tsx")) + list(root.glob("src/**/*.ts"))
-    findings = []
-    for f in files:
-        text = f.read_text(encoding="utf-8", errors="ignore")
-        if "node_modules" in str(f):
-            continue
-        for i, line in enumerate(text.splitlines(), start=1):
-            if HEX_RE.search(line):
-                findings.append(f"{f}:{i} contains raw color token")
-
-    report = {
-        "finding_count": len(findings),
-        "findings": findings,
-    }
+    audit = Audit()
+    paths = walk_sources(Path(args.root) / "src", Audit.SUFFIXES)
+    large = {path for path in paths if path.stat().st_size >= args.mmap_min_bytes > 0}
+    for path in sorted(large):
+        audit.visit_mapped(path)
+    for path, text in read_sources([path for path in paths if path not in large], DEFAULT_JOBS):
+        audit.visit(path, text)
+    report, exit_code = audit.finish()
     payload = json.dumps(report, indent=2)
     print(payload)
     if args.report:
         Path(args.report).write_text(payload, encoding="utf-8")
-    return 0
+    return exit_code
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
\ No newline at end of file
+    raise SystemExit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Walk the source tree once and hand every file to each registered source audit, or keep watching it."""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO
+
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
+
+# Directories never descended into, wherever they appear under the walked tree.
+IGNORED_DIRS = frozenset({"node_modules", ".git", "dist", "build", "coverage", "__pycache__"})
+DEFAULT_JOBS = 8
+# Seconds between polls, and how long an inotify wake-up waits for an editor's burst of writes to settle.
+WATCH_INTERVAL = 0.5
+
+# Check name -> (skill directory, audit module). Each module exposes ``Audit``: a class with a
+# ``SUFFIXES`` tuple, ``visit(path, text)`` for every matching file (replacing earlier findings for
+# that path), ``forget(path)`` for a file that went away, and ``finish()`` returning ``(report, exit_code)``.
+AUDITS = {
+    "theme-usage": ("mui-theme-system-governor", "audit_theme_usage"),
+    "grid-contract": ("mui-x-grid-query-integration", "check_grid_contract"),
+    "a11y-markers": ("mui-accessibility-hardening", "check_a11y_markers"),
+}
+
+
+def walk_sources(top: Path, suffixes: Iterable[str]) -> list[Path]:
+    """Files under ``top`` ending in one of ``suffixes``, sorted; ignored directories are never opened."""
+    suffixes = tuple(suffixes)
+    found: list[Path] = []
+    stack = [top]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in IGNORED_DIRS:
+                    stack.append(directory / entry.name)
+            elif entry.name.endswith(suffixes) and entry.is_file():
+                found.append(directory / entry.name)
+    return sorted(found)
+
+
+def read_sources(paths: list[Path], jobs: int = DEFAULT_JOBS) -> Iterator[tuple[Path, str]]:
+    """``(path, text)`` in ``paths`` order, read ahead by a thread pool."""
+
+    def read(path: Path) -> str:
+        return path.read_text(encoding="utf-8", errors="ignore")
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        yield from zip(paths, pool.map(read, paths))
+
+
+def scan_sources(root: Path, audits: Iterable[Any], jobs: int = DEFAULT_JOBS) -> int:
+    """Read each ``src/`` file once and pass its text to every audit whose suffixes match; returns files read."""
+    audits = list(audits)
+    suffixes = {suffix for audit in audits for suffix in audit.SUFFIXES}
+    paths = walk_sources(root / "src", suffixes)
+    for path, text in read_sources(paths, jobs):
+        for audit in audits:
+            if path.name.endswith(audit.SUFFIXES):
+                audit.visit(path, text)
+    return len(paths)
+
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+class PollingWatcher:
+    """Fallback watcher: every ``interval`` seconds asks for a stat-only resync of the whole tree."""
+
+    def __init__(self, top: Path, suffixes: Iterable[str], interval: float = WATCH_INTERVAL) -> None:
+        self.interval = interval
+
+    def changes(self) -> set[Path] | None:
+        time.sleep(self.interval)
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through libc, one watch per directory.
+
+    ``changes()`` blocks until something happens and returns the touched source files, or ``None`` when
+    directories appeared or vanished or the kernel queue overflowed and the caller should resync.
+    """
+
+    def __init__(self, top: Path, suffixes: Iterable[str], interval: float = WATCH_INTERVAL) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.suffixes = tuple(suffixes)
+        self.interval = interval
+        self.dirs: dict[int, Path] = {}
+        self.add_tree(top)
+
+    def add_tree(self, top: Path) -> None:
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK)
+            if wd < 0:
+                continue
+            self.dirs[wd] = directory
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and entry.name not in IGNORED_DIRS:
+                    stack.append(directory / entry.name)
+
+    def read_events(self) -> bytes:
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def changes(self) -> set[Path] | None:
+        select.select([self.fd], [], [])
+        time.sleep(self.interval)
+        data = self.read_events()
+        changed: set[Path] | None = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + INOTIFY_EVENT.size : offset + INOTIFY_EVENT.size + length].rstrip(b"\0"))
+            offset += INOTIFY_EVENT.size + length
+            directory = self.dirs.get(wd)
+            if mask & IN_Q_OVERFLOW:
+                changed = None
+            elif mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+            elif directory is None or not name:
+                continue
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in IGNORED_DIRS:
+                    self.add_tree(directory / name)
+                changed = None
+            elif changed is not None and name.endswith(self.suffixes):
+                changed.add(directory / name)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SourceWatch:
+    """Per-file audit state for ``src/`` that is kept current by re-auditing only files that changed."""
+
+    def __init__(self, root: Path, audits: Iterable[Any], jobs: int = DEFAULT_JOBS) -> None:
+        self.top = root / "src"
+        self.audits = list(audits)
+        self.suffixes = tuple({suffix for audit in self.audits for suffix in audit.SUFFIXES})
+        self.jobs = jobs
+        self.stamps: dict[Path, tuple[int, int]] = {}
+
+    def refresh(self, candidates: Iterable[Path] | None = None) -> list[Path]:
+        """Re-audit ``candidates`` (or, for ``None``, every file whose stamp moved); returns paths that changed."""
+        if candidates is None:
+            paths = set(walk_sources(self.top, self.suffixes))
+            stale = {path for path in paths if file_stamp(path) != self.stamps.get(path)}
+            gone = set(self.stamps) - paths
+        else:
+            candidates = set(candidates)
+            stale = {path for path in candidates if path.is_file()}
+            gone = (candidates - stale) & set(self.stamps)
+        for path in gone:
+            del self.stamps[path]
+            for audit in self.audits:
+                audit.forget(path)
+        for path, text in read_sources(sorted(stale), self.jobs):
+            stamp = file_stamp(path)
+            if stamp is not None:
+                self.stamps[path] = stamp
+            for audit in self.audits:
+                if path.name.endswith(audit.SUFFIXES):
+                    audit.visit(path, text)
+        return sorted(stale | gone)
+
+
+def watch_sources(
+    watch: SourceWatch,
+    names: list[str],
+    watcher: Any,
+    stream: TextIO,
+    report_path: Path | None = None,
+) -> None:
+    """Audit everything once, then publish the aggregate report after every batch of changes, forever."""
+    generation = 0
+    changed = watch.refresh()
+    while True:
+        if changed or generation == 0:
+            generation += 1
+            report = {
+                "checks": {name: audit.finish()[0] for name, audit in zip(names, watch.audits)},
+                "files_watched": len(watch.stamps),
+                "generation": generation,
+                "changed": [str(path) for path in changed],
+                "watcher": type(watcher).__name__,
+            }
+            stream.write(json.dumps(report) + "\n")
+            stream.flush()
+            if report_path is not None:
+                tmp = report_path.with_name(report_path.name + ".tmp")
+                tmp.write_text(json.dumps(report, indent=2), encoding="utf-8")
+                os.replace(tmp, report_path)
+        changed = watch.refresh(watcher.changes())
+
+
+def load_audit(name: str) -> Any:
+    return skill_module(*AUDITS[name])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default=".", help="Repository root")
+    parser.add_argument(
+        "--checks",
+        default="all",
+        help=f"Comma-separated audits to run from one walk of src/: {', '.join(AUDITS)} (default: all)",
+    )
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Threads reading files ahead of the audits")
+    parser.add_argument("--report", help="Optional path to write JSON report (rewritten atomically in watch mode)")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: re-audit changed files only and stream one JSON report line per update",
+    )
+    parser.add_argument("--poll", action="store_true", help="Watch by polling file stamps instead of inotify")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help=f"Watch poll/settle interval in seconds (default: {WATCH_INTERVAL})",
+    )
+    args = parser.parse_args()
+
+    names = list(AUDITS) if args.checks == "all" else args.checks.split(",")
+    unknown = [name for name in names if name not in AUDITS]
+    if unknown:
+        parser.error(f"unknown check(s): {', '.join(unknown)}")
+
+    audits = {name: load_audit(name).Audit() for name in names}
+    if args.watch:
+        watch = SourceWatch(Path(args.root), audits.values(), args.jobs)
+        watcher: Any = None
+        if not args.poll:
+            try:
+                watcher = InotifyWatcher(watch.top, watch.suffixes, args.interval)
+            except (OSError, AttributeError):
+                watcher = None
+        if watcher is None:
+            watcher = PollingWatcher(watch.top, watch.suffixes, args.interval)
+        try:
+            watch_sources(watch, list(audits), watcher, sys.stdout, Path(args.report) if args.report else None)
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            watcher.close()
+
+    files_read = scan_sources(Path(args.root), audits.values(), args.jobs)
+    reports: dict[str, Any] = {}
+    exit_code = 0
+    for name, audit in audits.items():
+        reports[name], status = audit.finish()
+        exit_code = exit_code or status
+
+    report = {"checks": reports, "files_read": files_read}
+    payload = json.dumps(report, indent=2)
+    print(payload)
+    if args.report:
+        Path(args.report).write_text(payload, encoding="utf-8")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
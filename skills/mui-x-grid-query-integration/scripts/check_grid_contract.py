@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import argparse, json
+import argparse, json, sys
 from pathlib import Path
 
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
+
 TOKENS = [
     "@mui/x-data-grid",
     "pagination",
@@ -12,29 +17,44 @@ TOKENS = [
 ]
 
 
+class Audit:
+    SUFFIXES = (".tsx", ".ts")
+
+    def __init__(self) -> None:
+        self.by_path: dict[Path, list[str]] = {}
+
+    def visit(self, path: Path, text: str) -> None:
+        text = text.lower()
+        self.by_path[path] = [token for token in TOKENS if token.lower() in text]
+
+    def forget(self, path: Path) -> None:
+        self.by_path.pop(path, None)
+
+    def finish(self) -> tuple[dict, int]:
+        hit_counts = {t: 0 for t in TOKENS}
+        for tokens in self.by_path.values():
+            for token in tokens:
+                hit_counts[token] += 1
+        return {"token_hits": hit_counts}, 0
+
+
 def main() -> int:
     p = argparse.ArgumentParser()
     p.add_argument("--root", default=".")
     p.add_argument("--report")
     args = p.parse_args()
 
-    root = Path(args.root)
-    files = list(root.glob("src/**/*.tsx")) + list(root.glob("src/**/*.ts"))
-    hit_counts = {t: 0 for t in TOKENS}
-
-    for f in files:
-        text = f.read_text(encoding="utf-8", errors="ignore").lower()
-        for token in TOKENS:
-            if token.lower() in text:
-                hit_counts[token] += 1
-
-    report = {"token_hits": hit_counts}
+    audit = Audit()
+    # The shared source walker lives with the theme governor.
+    src_scan = skill_module("mui-theme-system-governor", "src_scan")
+    src_scan.scan_sources(Path(args.root), [audit])
+    report, exit_code = audit.finish()
     payload = json.dumps(report, indent=2)
     print(payload)
     if args.report:
         Path(args.report).write_text(payload, encoding="utf-8")
-    return 0
+    return exit_code
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
\ No newline at end of file
+    raise SystemExit(main())
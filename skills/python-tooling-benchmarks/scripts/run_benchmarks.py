@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Benchmark the Python artifact tooling on synthetic corpora and compare against a baseline."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from synth_corpus import GENERATOR_VERSION, parse_size
+
+SKILLS = Path(__file__).resolve().parents[2]
+GENERATE = Path(__file__).resolve().parent / "synth_corpus.py"
+AUDIT = SKILLS / "artifact-contract-auditor" / "scripts" / "audit_artifacts.py"
+INFER = SKILLS / "graph-view-inference-rules" / "scripts" / "infer_clusters.py"
+VALIDATE = SKILLS / "constructed-world-map-compat" / "scripts" / "validate_scale_model.py"
+TILES = SKILLS / "constructed-world-map-compat" / "scripts" / "build_map_tiles.py"
+PLACES = SKILLS / "constructed-world-map-compat" / "scripts" / "place_index.py"
+BASELINE_PATH = Path(__file__).resolve().parent.parent / "references" / "baseline.json"
+RESULTS_VERSION = 1
+DEFAULT_SIZES = "10k,100k"
+DEFAULT_TOLERANCE = 1.25
+# A phase only regresses when it is also this much worse in absolute terms, so scheduler and
+# allocator noise on sub-second, small-footprint phases does not trip the ratio.
+DEFAULT_MIN_SECONDS = 0.5
+DEFAULT_MIN_RSS_MB = 8.0
+
+
+def infer(data_dir: Path, *extra: str) -> list[Any]:
+    return [INFER, "--assertions", data_dir / "assertions_by_id.json", *extra]
+
+
+# Phase name -> command builder (corpus dir, scratch dir); phases run in this order per corpus.
+PHASES = {
+    "audit": lambda d, w: [AUDIT, "--data-dir", d],
+    "audit_stream": lambda d, w: [AUDIT, "--data-dir", d, "--stream"],
+    "audit_jobs": lambda d, w: [AUDIT, "--data-dir", d, "--jobs", "0"],
+    "audit_cache_cold": lambda d, w: [AUDIT, "--data-dir", d, "--cache", w / "audit-cache.json"],
+    "audit_cache_warm": lambda d, w: [AUDIT, "--data-dir", d, "--cache", w / "audit-cache.json"],
+    "infer": lambda d, w: infer(d),
+    "infer_compact": lambda d, w: infer(d, "--evidence", "none", "--compact"),
+    "infer_clusters": lambda d, w: infer(d, "--evidence", "none", "--clusters"),
+    "infer_all_layers": lambda d, w: infer(d, "--evidence", "none", "--all-layers"),
+    "validate": lambda d, w: [VALIDATE, "--config", d / "world.json"],
+    "validate_python": lambda d, w: [VALIDATE, "--config", d / "world.json", "--engine", "python"],
+    "validate_stream": lambda d, w: [
+        VALIDATE,
+        "--config",
+        d / "world.json",
+        "--points",
+        d / "location_coordinates.json",
+    ],
+    "map_tiles": lambda d, w: [
+        TILES,
+        "--config",
+        d / "world.json",
+        "--points",
+        d / "location_coordinates.json",
+        "--out",
+        w / "map-tiles",
+    ],
+    "place_queries": lambda d, w: [
+        PLACES,
+        "--config",
+        d / "world.json",
+        "--points",
+        d / "location_coordinates.json",
+        "--queries",
+        d / "location_coordinates.json",
+        "--output",
+        w / "place-queries.json",
+    ],
+}
+# Phases that only measure something with several cores. They are skipped on a single-CPU machine
+# and compared only against a baseline recorded with the same CPU count.
+MULTICORE_PHASES = {"audit_jobs"}
+
+
+def measure(command: list[Any]) -> dict[str, Any]:
+    """Run one phase and return wall time, the child's own peak RSS, and its exit code.
+
+    ``os.wait4`` reports resource usage for that child alone, unlike ``RUSAGE_CHILDREN``,
+    which keeps the maximum over every child run so far.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *map(str, command)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = usage.ru_maxrss / (1024 * 1024) if sys.platform == "darwin" else usage.ru_maxrss / 1024
+    return {"seconds": round(seconds, 3), "peak_rss_mb": round(peak, 1), "exit_code": process.returncode}
+
+
+def prepare_corpus(
+    work_dir: Path, size: int, seed: int, regenerate: bool
+) -> tuple[Path, dict[str, Any], dict[str, Any] | None]:
+    """Reuse a matching corpus under ``work_dir`` or generate it in a child process.
+
+    Generating out of process keeps the harness small: a forked child starts its peak RSS
+    from the parent's, which would otherwise inflate every later measurement.
+    """
+    corpus_dir = work_dir / f"corpus-{size}-seed{seed}"
+    stamp = corpus_dir / "corpus.json"
+    if not regenerate and stamp.exists():
+        summary = json.loads(stamp.read_text(encoding="utf-8"))
+        if summary.get("generator_version") == GENERATOR_VERSION:
+            return corpus_dir, summary, None
+    generated = measure([GENERATE, "--out", corpus_dir, "--assertions", str(size), "--seed", str(seed)])
+    if generated["exit_code"] != 0:
+        raise SystemExit(f"corpus generation failed for {size} assertions")
+    return corpus_dir, json.loads(stamp.read_text(encoding="utf-8")), generated
+
+
+def compare(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float,
+    floors: dict[str, float],
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Regressions against ``baseline``, and the ``size/phase`` labels it has no comparable entry for.
+
+    A metric regresses when it exceeds the baseline by more than ``tolerance`` times and by more
+    than its absolute ``floors`` entry.
+    """
+    regressions = []
+    unbaselined = []
+    same_cpus = baseline.get("environment", {}).get("cpus") == results["environment"]["cpus"]
+    for label, entry in results["sizes"].items():
+        base_phases = baseline.get("sizes", {}).get(label, {}).get("phases", {})
+        for phase, measured in entry["phases"].items():
+            base = base_phases.get(phase)
+            if not base or (phase in MULTICORE_PHASES and not same_cpus):
+                unbaselined.append(f"{label}/{phase}")
+                continue
+            for metric in ("seconds", "peak_rss_mb"):
+                over = measured[metric] - base[metric]
+                if base[metric] > 0 and measured[metric] > base[metric] * tolerance and over > floors[metric]:
+                    regressions.append(
+                        {
+                            "size": label,
+                            "phase": phase,
+                            "metric": metric,
+                            "baseline": base[metric],
+                            "measured": measured[metric],
+                            "ratio": round(measured[metric] / base[metric], 2),
+                        }
+                    )
+    return regressions, unbaselined
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated assertion counts, e.g. 10k,100k,1m")
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic corpus seed")
+    parser.add_argument(
+        "--work-dir",
+        default=".tmp/bench",
+        help="Where corpora are kept between runs; per-run scratch dirs are created and removed here",
+    )
+    parser.add_argument("--regenerate", action="store_true", help="Regenerate corpora even when a matching one exists")
+    parser.add_argument(
+        "--phases",
+        help=f"Comma-separated subset of phases to run (default: all of {', '.join(PHASES)})",
+    )
+    parser.add_argument("--out", help="Write results JSON here (use references/baseline.json to refresh the baseline)")
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=str(BASELINE_PATH),
+        help="Compare against a baseline results file (default: references/baseline.json)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed ratio over the baseline before a phase counts as a regression",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=DEFAULT_MIN_SECONDS,
+        help=f"Ignore time increases smaller than this many seconds (default: {DEFAULT_MIN_SECONDS})",
+    )
+    parser.add_argument(
+        "--min-rss-mb",
+        type=float,
+        default=DEFAULT_MIN_RSS_MB,
+        help=f"Ignore peak RSS increases smaller than this many MB (default: {DEFAULT_MIN_RSS_MB})",
+    )
+    args = parser.parse_args()
+
+    if args.phases:
+        phases = args.phases.split(",")
+    else:
+        multicore = (os.cpu_count() or 1) > 1
+        phases = [name for name in PHASES if multicore or name not in MULTICORE_PHASES]
+    unknown = [name for name in phases if name not in PHASES]
+    if unknown:
+        parser.error(f"unknown phase(s): {', '.join(unknown)}")
+    work_dir = Path(args.work_dir)
+
+    results: dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "generator_version": GENERATOR_VERSION,
+        "seed": args.seed,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "sizes": {},
+    }
+    for label in args.sizes.split(","):
+        size = parse_size(label)
+        corpus_dir, corpus, generated = prepare_corpus(work_dir, size, args.seed, args.regenerate)
+        # Every run starts from an empty, uniquely named scratch dir (no audit cache, no earlier tiles).
+        # Rewriting thousands of just-deleted tile paths is several times slower on some filesystems,
+        # which would otherwise be measured as a map_tiles regression.
+        scratch = Path(tempfile.mkdtemp(prefix=f"scratch-{size}-", dir=work_dir))
+        entry: dict[str, Any] = {"corpus": corpus, "generate": generated, "phases": {}}
+        try:
+            for name in phases:
+                entry["phases"][name] = measure(PHASES[name](corpus_dir, scratch))
+                print(f"{label:>6} {name:<18} {entry['phases'][name]}", file=sys.stderr)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        results["sizes"][label] = entry
+
+    failed = [
+        f"{label}/{name}"
+        for label, entry in results["sizes"].items()
+        for name, measured in entry["phases"].items()
+        if measured["exit_code"] != 0
+    ]
+    results["failed_phases"] = failed
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        floors = {"seconds": args.min_seconds, "peak_rss_mb": args.min_rss_mb}
+        results["regressions"], results["unbaselined"] = compare(results, baseline, args.tolerance, floors)
+
+    payload = json.dumps(results, indent=2)
+    print(payload)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(payload + "\n", encoding="utf-8")
+    return 1 if failed or results.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
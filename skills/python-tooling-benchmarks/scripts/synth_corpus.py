@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Generate a deterministic synthetic artifact set shaped like public/data."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any, TextIO
+
+GENERATOR_VERSION = 1
+LAYERS = [
+    "canon",
+    "narrative.byzantine_imperial_claims",
+    "narrative.latin_crusader_claims",
+    "narrative.outremer_as_plurality",
+    "narrative.romaios_vs_latin_diplomatic",
+    "narrative.tentative.consensus",
+    "narrative.turkic_frontier_pragmatic",
+]
+CANON_SHARE = 0.94
+
+# (relation, source property, weight, object is a place); weights follow public/data.
+RELATIONS = [
+    ("parent_of", "P40", 292, False),
+    ("child_of", "P22", 234, False),
+    ("described_by", "P1343", 189, False),
+    ("spouse_of", "P26", 118, False),
+    ("citizen_of", "P27", 86, True),
+    ("holds_office", "P39", 54, False),
+    ("born_in", "P19", 47, True),
+    ("died_in", "P20", 47, True),
+    ("located_in", "P131", 24, True),
+    ("worked_in", "P937", 5, True),
+]
+# Mirrors the share of out-of-range coordinates the validator should flag.
+OUT_OF_BOUNDS_EVERY = 1000
+
+
+def parse_size(text: str) -> int:
+    """``10k``/``1m``/``2500`` style counts."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def write_indented(handle: TextIO, value: Any, prefix: str) -> None:
+    """Write ``value`` as ``json.dump(indent=2)`` would at nesting depth ``len(prefix) // 2``."""
+    handle.write(json.dumps(value, indent=2).replace("\n", "\n" + prefix))
+
+
+class StreamedCollection:
+    """Write a top-level array or object one record at a time in the importer's two-space layout."""
+
+    def __init__(self, path: Path, root: str) -> None:
+        self.handle = path.open("w", encoding="utf-8")
+        self.root = root
+        self.count = 0
+        self.handle.write(root)
+
+    def add(self, value: Any, key: str | None = None) -> None:
+        self.handle.write(",\n  " if self.count else "\n  ")
+        if key is not None:
+            self.handle.write(json.dumps(key) + ": ")
+        write_indented(self.handle, value, "  ")
+        self.count += 1
+
+    def close(self) -> None:
+        closer = "]" if self.root == "[" else "}"
+        self.handle.write(f"\n{closer}" if self.count else closer)
+        self.handle.close()
+
+
+def write_json(path: Path, value: Any) -> None:
+    path.write_text(json.dumps(value, indent=2), encoding="utf-8")
+
+
+def generate(out_dir: Path, assertions: int, seed: int) -> dict[str, Any]:
+    """Write the artifact set for ``assertions`` records into ``out_dir`` and return its summary.
+
+    Records stream straight to disk; only ids for the layer and person indexes are kept.
+    Subjects are drawn with a cubic skew so a few entities become high-degree hubs.
+    """
+    rng = random.Random(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    entity_count = max(50, assertions // 5)
+    place_count = max(10, entity_count // 10)
+    places = [f"Q{2_000_000 + i}" for i in range(place_count)]
+    people = [f"Q{1_000_000 + i}" for i in range(entity_count - place_count)]
+    person_ids = people[: max(1, len(people) * 9 // 20)]
+    weights = [weight for _, _, weight, _ in RELATIONS]
+
+    listed = StreamedCollection(out_dir / "assertions.json", "[")
+    by_id = StreamedCollection(out_dir / "assertions_by_id.json", "{")
+    by_layer: dict[str, list[str]] = {layer: [] for layer in LAYERS}
+    by_person: dict[str, list[str]] = {}
+    by_person_layer: dict[str, dict[str, list[str]]] = {}
+    for i in range(assertions):
+        rel, pid, _, to_place = rng.choices(RELATIONS, weights)[0]
+        subject = people[int(len(people) * rng.random() ** 3)]
+        obj = rng.choice(places) if to_place else rng.choice(people)
+        layer = "canon" if rng.random() < CANON_SHARE else rng.choice(LAYERS[1:])
+        assertion_id = f"a.synth.{pid}.{i + 1:07d}"
+        record = {
+            "id": assertion_id,
+            "subject": subject,
+            "predicate": rel,
+            "object": obj,
+            "extensions": {
+                "psellos": {
+                    "rel": rel,
+                    "layer": layer,
+                    "source": "synthetic",
+                    "raw": {
+                        "id": assertion_id,
+                        "predicate_pid": pid,
+                        "relation_mapped": rel,
+                        "status": "candidate",
+                        "provenance": {"source": "synthetic", "run_id": f"synth-{seed}"},
+                    },
+                }
+            },
+        }
+        listed.add(record)
+        by_id.add(record, assertion_id)
+        by_layer[layer].append(assertion_id)
+        for entity in dict.fromkeys((subject, obj)):
+            by_person.setdefault(entity, []).append(assertion_id)
+            by_person_layer.setdefault(entity, {}).setdefault(layer, []).append(assertion_id)
+    listed.close()
+    by_id.close()
+
+    write_json(out_dir / "assertions_by_layer.json", by_layer)
+    write_json(out_dir / "assertions_by_person.json", by_person)
+    write_json(out_dir / "assertions_by_person_by_layer.json", by_person_layer)
+    write_json(out_dir / "layers.json", LAYERS)
+    persons = {
+        qid: {
+            "id": qid,
+            "qid": qid,
+            "label": f"Person {qid}",
+            "entity_types": ["persons"],
+            "source_entity_ids": [],
+            "entity_type": "persons",
+        }
+        for qid in person_ids
+    }
+    write_json(out_dir / "persons.json", persons)
+    manifest = {
+        "spec_version": "compiled-dist-run.v1",
+        "builder_version": f"synthetic-v{GENERATOR_VERSION}",
+        "counts": {"persons": len(persons), "assertions": assertions},
+        "person_index": {qid: record["label"] for qid, record in persons.items()},
+    }
+    write_json(out_dir / "manifest.json", manifest)
+
+    items = []
+    for i, qid in enumerate(places):
+        lat, lon = round(rng.uniform(30.0, 48.0), 6), round(rng.uniform(-10.0, 45.0), 6)
+        if i % OUT_OF_BOUNDS_EVERY == OUT_OF_BOUNDS_EVERY - 1:
+            lat = 91.5
+        items.append({"qid": qid, "name": f"Place {i}", "lat": lat, "lon": lon})
+    write_json(out_dir / "location_coordinates.json", {"version": "v1.location-canonical-shape", "items": items})
+    world = {
+        "world": {"name": "Synthetic", "reference_radius_km": 6371.0, "radius_km": 4500.0},
+        "projection": "geodetic",
+        "points": [{"id": item["qid"], "lat": item["lat"], "lon": item["lon"]} for item in items],
+    }
+    write_json(out_dir / "world.json", world)
+
+    summary = {
+        "generator_version": GENERATOR_VERSION,
+        "seed": seed,
+        "assertions": assertions,
+        "entities": entity_count,
+        "persons": len(persons),
+        "places": place_count,
+        "bytes": sum(path.stat().st_size for path in out_dir.glob("*.json") if path.name != "corpus.json"),
+    }
+    write_json(out_dir / "corpus.json", summary)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", required=True, help="Directory to write the artifact set into")
+    parser.add_argument("--assertions", default="10k", help="Assertion count, e.g. 10k, 100k, 1m")
+    parser.add_argument("--seed", type=int, default=7, help="Generator seed")
+    args = parser.parse_args()
+
+    summary = generate(Path(args.out), parse_size(args.assertions), args.seed)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
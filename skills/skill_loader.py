@@ -0,0 +1,24 @@
+"""Shared loader for scripts that reuse another skill's modules.
+
+Skills keep their scripts in ``skills/<skill>/scripts`` with no package around them. A script
+that needs another skill's module puts ``skills/`` on ``sys.path``, imports ``skill_module``
+from here, and calls it where the other module is first needed, so unrelated runs never
+import it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from pathlib import Path
+from typing import Any
+
+SKILLS = Path(__file__).resolve().parent
+
+
+def skill_module(skill: str, module: str) -> Any:
+    """Import ``module`` from ``skills/<skill>/scripts``, adding that directory to ``sys.path`` once."""
+    scripts = str(SKILLS / skill / "scripts")
+    if scripts not in sys.path:
+        sys.path.append(scripts)
+    return importlib.import_module(module)
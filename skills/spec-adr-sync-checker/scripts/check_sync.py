@@ -7,6 +7,9 @@ import argparse
 import json
 import sys
 from pathlib import Path
+from typing import Any
+
+from doc_scan import DocumentScan, scan_documents
 
 
 REQUIRED_PATTERNS = {
@@ -38,29 +41,29 @@ REQUIRED_PATTERNS = {
 }
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--root", default=".", help="Repository root")
-    parser.add_argument("--report", help="Optional path to write JSON report")
-    args = parser.parse_args()
+BUCKET_PHRASE = "unknown/ambiguous"
+PHRASES = {
+    **REQUIRED_PATTERNS,
+    "docs/DATA_QUERY_SPEC.md": [*REQUIRED_PATTERNS["docs/DATA_QUERY_SPEC.md"], BUCKET_PHRASE],
+    "docs/UX_NAV_SPEC.md": [*REQUIRED_PATTERNS["docs/UX_NAV_SPEC.md"], BUCKET_PHRASE],
+}
 
-    root = Path(args.root)
+
+def evaluate(root: Path, scan: DocumentScan) -> tuple[dict[str, Any], int]:
     errors: list[str] = []
     warnings: list[str] = []
 
     for rel_path, patterns in REQUIRED_PATTERNS.items():
-        path = root / rel_path
-        if not path.exists():
+        if not scan.exists(rel_path):
             errors.append(f"Missing required document: {rel_path}")
             continue
-        text = path.read_text(encoding="utf-8").lower()
         for pattern in patterns:
-            if pattern not in text:
+            if not scan.contains(rel_path, pattern):
                 errors.append(f"{rel_path} missing required phrase: {pattern}")
 
-    data_spec = (root / "docs/DATA_QUERY_SPEC.md").read_text(encoding="utf-8").lower()
-    ux_spec = (root / "docs/UX_NAV_SPEC.md").read_text(encoding="utf-8").lower()
-    if "unknown/ambiguous" not in data_spec and "unknown/ambiguous" in ux_spec:
+    if not scan.contains("docs/DATA_QUERY_SPEC.md", BUCKET_PHRASE) and scan.contains(
+        "docs/UX_NAV_SPEC.md", BUCKET_PHRASE
+    ):
         warnings.append("UX references unknown/ambiguous buckets but data spec does not mention them.")
 
     report = {
@@ -69,12 +72,23 @@ def main() -> int:
         "errors": errors,
         "warnings": warnings,
     }
+    return report, 1 if errors else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default=".", help="Repository root")
+    parser.add_argument("--report", help="Optional path to write JSON report")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    report, exit_code = evaluate(root, scan_documents(root, PHRASES))
     print(json.dumps(report, indent=2))
 
     if args.report:
         Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
 
-    return 1 if errors else 0
+    return exit_code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Scan policy documents once for every phrase the policy checkers need."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
+
+# Check name -> (skill directory, checker module). Each module exposes ``PHRASES`` (relative path ->
+# lowercase phrases it looks up) and ``evaluate(root, scan)`` returning ``(report, exit_code)``.
+CHECKERS = {
+    "spec-adr-sync": ("spec-adr-sync-checker", "check_sync"),
+    "url-policy": ("url-state-filter-policy-tester", "check_url_policy"),
+    "filter-sync": ("mui-filter-url-state-sync", "check_filter_sync"),
+    "release-gate": ("desktop-release-gate", "run_release_gate"),
+}
+
+
+class PhraseAutomaton:
+    """Aho-Corasick matcher reporting which of a fixed phrase set occur in a text, in one pass."""
+
+    def __init__(self, phrases: Iterable[str]) -> None:
+        self.goto: list[dict[str, int]] = [{}]
+        self.output: list[set[str]] = [set()]
+        for phrase in phrases:
+            if not phrase:
+                continue
+            state = 0
+            for char in phrase:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.output.append(set())
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].add(phrase)
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] |= self.output[self.fail[child]]
+
+    def search(self, text: str) -> set[str]:
+        goto, fail, output = self.goto, self.fail, self.output
+        found: set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+@dataclass
+class DocumentScan:
+    """Phrases found per document; documents that do not exist are listed in ``missing``."""
+
+    found: dict[str, set[str]] = field(default_factory=dict)
+    missing: set[str] = field(default_factory=set)
+    reads: int = 0
+
+    def exists(self, rel_path: str) -> bool:
+        return rel_path not in self.missing
+
+    def contains(self, rel_path: str, phrase: str) -> bool:
+        """Whether the lowercased document holds ``phrase``; the phrase must have been requested."""
+        return phrase in self.found.get(rel_path, ())
+
+
+def merge_phrases(*requirements: Mapping[str, Iterable[str]]) -> dict[str, set[str]]:
+    merged: dict[str, set[str]] = {}
+    for requirement in requirements:
+        for rel_path, phrases in requirement.items():
+            merged.setdefault(rel_path, set()).update(phrases)
+    return merged
+
+
+def scan_documents(root: Path, *requirements: Mapping[str, Iterable[str]]) -> DocumentScan:
+    """Read and lowercase each requested document once and match the union of all phrases against it."""
+    merged = merge_phrases(*requirements)
+    automaton = PhraseAutomaton(sorted(set().union(*merged.values())))
+    scan = DocumentScan()
+    for rel_path, wanted in merged.items():
+        path = root / rel_path
+        if not path.exists():
+            scan.missing.add(rel_path)
+            continue
+        if not wanted:
+            continue
+        scan.reads += 1
+        scan.found[rel_path] = automaton.search(path.read_text(encoding="utf-8").lower()) & wanted
+    return scan
+
+
+def load_checker(name: str) -> Any:
+    return skill_module(*CHECKERS[name])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default=".", help="Repository root")
+    parser.add_argument(
+        "--checks",
+        default="all",
+        help=f"Comma-separated checks to run from one shared scan: {', '.join(CHECKERS)} (default: all)",
+    )
+    parser.add_argument("--report", help="Optional path to write JSON report")
+    args = parser.parse_args()
+
+    names = list(CHECKERS) if args.checks == "all" else args.checks.split(",")
+    unknown = [name for name in names if name not in CHECKERS]
+    if unknown:
+        parser.error(f"unknown check(s): {', '.join(unknown)}")
+
+    root = Path(args.root)
+    checkers = {name: load_checker(name) for name in names}
+    scan = scan_documents(root, *(checker.PHRASES for checker in checkers.values()))
+    reports: dict[str, Any] = {}
+    exit_code = 0
+    for name, checker in checkers.items():
+        reports[name], status = checker.evaluate(root, scan)
+        exit_code = exit_code or status
+
+    report = {"checks": reports, "documents_read": scan.reads, "documents_missing": sorted(scan.missing)}
+    payload = json.dumps(report, indent=2)
+    print(payload)
+    if args.report:
+        Path(args.report).write_text(payload, encoding="utf-8")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,15 @@ import argparse
 import json
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from doc_scan import DocumentScan
+
+SKILLS = Path(__file__).resolve().parents[2]
+if str(SKILLS) not in sys.path:
+    sys.path.append(str(SKILLS))
+from skill_loader import skill_module
 
 DOC_REQUIREMENTS = {
     "docs/UX_NAV_SPEC.md": [
@@ -37,38 +45,27 @@ SOURCE_HINTS = {
 }
 
 
-def read_lower(path: Path) -> str:
-    return path.read_text(encoding="utf-8").lower()
+PHRASES = {**DOC_REQUIREMENTS, **SOURCE_HINTS}
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--root", default=".", help="Repository root")
-    parser.add_argument("--report", help="Optional JSON report output path")
-    args = parser.parse_args()
-
-    root = Path(args.root)
+def evaluate(root: Path, scan: DocumentScan) -> tuple[dict[str, Any], int]:
     errors: list[str] = []
     warnings: list[str] = []
 
     for rel_path, patterns in DOC_REQUIREMENTS.items():
-        path = root / rel_path
-        if not path.exists():
+        if not scan.exists(rel_path):
             errors.append(f"Missing doc: {rel_path}")
             continue
-        text = read_lower(path)
         for pattern in patterns:
-            if pattern not in text:
+            if not scan.contains(rel_path, pattern):
                 errors.append(f"{rel_path} missing required policy phrase: {pattern}")
 
     for rel_path, patterns in SOURCE_HINTS.items():
-        path = root / rel_path
-        if not path.exists():
+        if not scan.exists(rel_path):
             warnings.append(f"Source file missing for hint checks: {rel_path}")
             continue
-        text = read_lower(path)
         for pattern in patterns:
-            if pattern not in text:
+            if not scan.contains(rel_path, pattern):
                 warnings.append(f"{rel_path} missing implementation hint token: {pattern}")
 
     report = {
@@ -77,12 +74,25 @@ def main() -> int:
         "errors": errors,
         "warnings": warnings,
     }
+    return report, 1 if errors else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default=".", help="Repository root")
+    parser.add_argument("--report", help="Optional JSON report output path")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    # The shared document scanner lives with the spec/ADR sync checker.
+    doc_scan = skill_module("spec-adr-sync-checker", "doc_scan")
+    report, exit_code = evaluate(root, doc_scan.scan_documents(root, PHRASES))
     print(json.dumps(report, indent=2))
 
     if args.report:
         Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
 
-    return 1 if errors else 0
+    return exit_code
 
 
 if __name__ == "__main__":